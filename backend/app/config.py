@@ -4,7 +4,9 @@ Configuration management using Pydantic settings.
 Loads environment variables and provides typed configuration access.
 """
 
-from typing import List
+from functools import cached_property, lru_cache
+from typing import List, Union
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -16,6 +18,8 @@ class Settings(BaseSettings):
     supabase_service_role_key: str
     supabase_anon_key: str = ""  # Optional for backend
     supabase_jwks_url: str = ""  # Will be derived from supabase_url if not set
+    supabase_max_connections: int = 20  # PostgREST HTTP connection pool size
+    supabase_pool_timeout: float = 30.0  # Seconds to wait for a free pooled connection
 
     # OpenAI
     openai_api_key: str
@@ -29,20 +33,27 @@ class Settings(BaseSettings):
 
     # Application
     env: str = "dev"  # dev, staging, prod
-    cors_origins: str = "http://localhost:5173"  # Comma-separated
+    enable_openapi: bool = True  # Serve /openapi.json, /docs and /redoc
+    threadpool_size: int = 100  # Concurrent sync handlers (blocking Supabase calls)
+    # Comma-separated in the environment, split into a list at load time.
+    # The str member of the Union stops pydantic-settings from requiring JSON.
+    cors_origins: Union[List[str], str] = ["http://localhost:5173"]
 
-    # Derived properties
-    @property
-    def cors_origins_list(self) -> List[str]:
+    @field_validator("cors_origins", mode="before")
+    @classmethod
+    def _split_cors_origins(cls, value):
         """Parse comma-separated CORS origins."""
-        return [origin.strip() for origin in self.cors_origins.split(",")]
+        if isinstance(value, str):
+            return [origin.strip() for origin in value.split(",")]
+        return value
 
-    @property
+    # Derived properties (computed once per Settings instance)
+    @cached_property
     def is_dev(self) -> bool:
         """Check if running in development mode."""
         return self.env == "dev"
 
-    @property
+    @cached_property
     def use_stub_ocr(self) -> bool:
         """Use stub OCR client in development."""
         return self.is_dev and not self.ocr_api_url
@@ -54,5 +65,15 @@ class Settings(BaseSettings):
     )
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache()
+def get_settings() -> Settings:
+    """
+    Get application settings (cached).
+
+    Settings are loaded on first use rather than at import time, so importing
+    this module does not read .env or validate the environment.
+
+    Returns:
+        Settings instance shared for the process
+    """
+    return Settings()
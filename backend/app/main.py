@@ -4,38 +4,98 @@ FastAPI application entry point for Time Browser backend.
 This is the main application file that sets up routes, middleware, and CORS.
 """
 
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import anyio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+
+from app.config import get_settings
+from app.dependencies import create_supabase_client
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _deferred_init(app: FastAPI) -> None:
+    """
+    Finish application startup after the server is accepting connections.
+
+    Imports and registers the API routers, then builds the Supabase client
+    in a worker thread. Flips ``app.state.ready`` once both are done. On
+    failure, logs the error and sets ``app.state.startup_failed`` so the
+    liveness probe fails and the process gets restarted.
+    """
+    try:
+        from app.routes import issues, pages
+
+        app.include_router(issues.router)
+        app.include_router(pages.router)
+
+        app.state.supabase = await anyio.to_thread.run_sync(create_supabase_client)
+        app.state.ready = True
+    except Exception:
+        # Nothing awaits this task, so handle the error here rather than re-raise
+        logger.exception("Deferred application startup failed")
+        app.state.startup_failed = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan handler.
 
-from app.config import settings
-from app.routes import issues, pages
+    Schedules the heavy part of startup as a background task so Uvicorn can
+    bind its socket immediately; ``/health/ready`` reports when it is done.
 
+    Also sizes the threadpool that runs the sync route handlers. Each one
+    holds a thread while it waits on Supabase, so this caps how many
+    requests can be waiting on the database at once.
+
+    On shutdown, closes the Supabase client's pooled HTTP connections.
+    """
+    anyio.to_thread.current_default_thread_limiter().total_tokens = get_settings().threadpool_size
+    # The event loop only keeps a weak reference to tasks
+    app.state.init_task = asyncio.create_task(_deferred_init(app))
+    yield
+    if not app.state.init_task.done():
+        app.state.init_task.cancel()
+
+    supabase = getattr(app.state, "supabase", None)
+    if supabase is not None:
+        supabase.postgrest.aclose()
+
+
+settings = get_settings()
 
 # Create FastAPI app
 app = FastAPI(
     title="Time Browser API",
     description="Historical newspaper exploration and search API",
     version="0.1.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
+    openapi_url="/openapi.json" if settings.enable_openapi else None,
+    docs_url="/docs" if settings.enable_openapi else None,
+    redoc_url="/redoc" if settings.enable_openapi else None,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
+app.state.ready = False
+app.state.startup_failed = False
 
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins_list,
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 
-# Include routers
-app.include_router(issues.router)
-app.include_router(pages.router)
-
-
 @app.get("/")
 def root():
     """Root endpoint - API health check."""
@@ -43,7 +103,7 @@ def root():
         "service": "Time Browser API",
         "version": "0.1.0",
         "status": "running",
-        "docs": "/docs",
+        "docs": app.docs_url,
     }
 
 
@@ -51,3 +111,19 @@ def root():
 def health_check():
     """Health check endpoint for monitoring."""
     return {"status": "healthy"}
+
+
+@app.get("/health/live")
+def liveness_check():
+    """Liveness probe - the process is up and deferred startup has not failed."""
+    if app.state.startup_failed:
+        return ORJSONResponse(status_code=503, content={"status": "startup_failed"})
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+def readiness_check():
+    """Readiness probe - routers are registered and the database client exists."""
+    if not app.state.ready:
+        return ORJSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
@@ -45,6 +45,20 @@ class PageResponse(BaseModel):
         from_attributes = True
 
 
+class PageSummaryResponse(BaseModel):
+    """Response model for a page in an issue's page list (no OCR data)."""
+
+    id: UUID
+    issue_id: UUID
+    page_number: int
+    image_path: str
+    ingestion_status: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class IssueResponse(BaseModel):
     """Response model for issue data with optional page details."""
 
@@ -71,12 +85,17 @@ class PaginatedIssuesResponse(BaseModel):
     """Paginated response for issues list."""
 
     items: List[IssueResponse]
-    total: int
+    total: Optional[int] = Field(
+        default=None, description="Total matching issues (first page and offset requests only)"
+    )
     limit: int
     offset: int
     has_more: bool = Field(
         ..., description="Whether there are more results available"
     )
+    next_cursor: Optional[str] = Field(
+        default=None, description="Cursor for the next page (None on the last page)"
+    )
 
 
 class PaginatedPagesResponse(BaseModel):
@@ -94,7 +113,8 @@ class IssueDetailResponse(IssueResponse):
     Detailed issue response including newspaper info and pages.
 
     Extends IssueResponse with guaranteed newspaper and pages data.
+    Pages are summaries: OCR text is served by the page detail endpoint.
     """
 
     newspaper: NewspaperResponse
-    pages: List[PageResponse]
+    pages: List[PageSummaryResponse]
@@ -1,5 +1,5 @@
 # Database models package
-from .browse import Newspaper, Issue, Page
+from .browse import Newspaper, Issue, Page, PageSummary
 from .retrieval import Segment, IngestJob
 
-__all__ = ["Newspaper", "Issue", "Page", "Segment", "IngestJob"]
+__all__ = ["Newspaper", "Issue", "Page", "PageSummary", "Segment", "IngestJob"]
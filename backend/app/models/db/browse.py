@@ -65,6 +65,20 @@ class Page(BaseModel):
     updated_at: datetime
 
 
+class PageSummary(BaseModel):
+    """A page without its OCR data, for listing pages of an issue."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    issue_id: UUID
+    page_number: int
+    image_path: str
+    ingestion_status: str = "pending"
+    created_at: datetime
+    updated_at: datetime
+
+
 # ============================================================================
 # Create models (for inserts)
 # ============================================================================
@@ -2,13 +2,20 @@
 Repositories package - Data access layer.
 
 Repositories provide CRUD operations and query methods for database tables.
+
+Repository classes are resolved lazily (PEP 562), so importing one of them
+only loads its own module rather than every repository in the package.
 """
 
-from app.repositories.base import BaseRepository
-from app.repositories.newspapers import NewspaperRepository
-from app.repositories.issues import IssueRepository
-from app.repositories.pages import PageRepository
-from app.repositories.ingest_jobs import IngestJobRepository
+from importlib import import_module
+
+_SUBMODULE_ATTRS = {
+    "BaseRepository": "base",
+    "NewspaperRepository": "newspapers",
+    "IssueRepository": "issues",
+    "PageRepository": "pages",
+    "IngestJobRepository": "ingest_jobs",
+}
 
 __all__ = [
     "BaseRepository",
@@ -17,3 +24,18 @@ __all__ = [
     "PageRepository",
     "IngestJobRepository",
 ]
+
+
+def __getattr__(name: str):
+    """Import the submodule that defines ``name`` on first access."""
+    submodule = _SUBMODULE_ATTRS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(f"{__name__}.{submodule}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -5,19 +5,101 @@ Provides shared functionality for all repositories including
 connection management and common query patterns.
 """
 
-from typing import TypeVar, Generic, Type, Optional, List, Any
+import base64
+from functools import lru_cache
+from threading import Lock
+from typing import TYPE_CHECKING, TypeVar, Generic, Type, Optional, List, Any, Union, Callable
 from uuid import UUID
-from supabase import Client
-from pydantic import BaseModel
+from cachetools import TTLCache
+from pydantic import BaseModel, TypeAdapter
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 
 T = TypeVar("T", bound=BaseModel)
 
 
+def _id_str(value: Union[UUID, str]) -> str:
+    """Return an ID as a string, skipping the conversion if it already is one."""
+    return value if isinstance(value, str) else str(value)
+
+
+def _canonical_id(value: Union[UUID, str]) -> str:
+    """
+    Return an ID in the canonical lowercase form the database returns.
+
+    Use for keys compared against IDs read back from rows; string IDs from
+    callers may be upper-case or otherwise non-canonical.
+
+    Raises:
+        ValueError: If value is not a valid UUID
+    """
+    return str(value) if isinstance(value, UUID) else str(UUID(value))
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model_class: Type[BaseModel]) -> TypeAdapter:
+    """TypeAdapter validating a list of rows into model_class (built once per model)."""
+    return TypeAdapter(List[model_class])
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode keyset pagination values into an opaque cursor string.
+
+    Args:
+        values: Sort key values of the last row on a page (e.g. date, id)
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = "|".join(str(value) for value in values)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> List[str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+        size: Number of values the cursor must contain
+
+    Returns:
+        Sort key values as strings
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        values = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    if len(values) != size:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
+
+
 class BaseRepository(Generic[T]):
     """Base repository with common CRUD operations."""
 
-    def __init__(self, supabase: Client, table_name: str, model_class: Type[T]):
+    # Columns fetched by list queries. Subclasses narrow this to skip bulky
+    # columns that list responses never render.
+    LIST_COLUMNS = "*"
+
+    # In-process cache for hot, rarely-changing list queries (see _cached_list)
+    LIST_CACHE_SIZE = 256
+    LIST_CACHE_TTL = 30  # seconds
+
+    def __init__(
+        self,
+        supabase: "Client",
+        table_name: str,
+        model_class: Type[T],
+        trust_rows: bool = False,
+    ):
         """
         Initialize base repository.
 
@@ -25,17 +107,23 @@ class BaseRepository(Generic[T]):
             supabase: Supabase client instance
             table_name: Name of the database table
             model_class: Pydantic model class for this table
+            trust_rows: If True, list queries build models with model_construct
+                (no validation or type coercion, so UUID/datetime columns stay
+                strings). Meant for production, where rows come from our schema.
         """
         self.supabase = supabase
         self.table_name = table_name
         self.model_class = model_class
+        self.trust_rows = trust_rows
+        self._list_cache = TTLCache(maxsize=self.LIST_CACHE_SIZE, ttl=self.LIST_CACHE_TTL)
+        self._list_cache_lock = Lock()
 
-    def get_by_id(self, id: UUID) -> Optional[T]:
+    def get_by_id(self, id: Union[UUID, str]) -> Optional[T]:
         """
         Get a single record by ID.
 
         Args:
-            id: Record UUID
+            id: Record UUID (or its string form)
 
         Returns:
             Model instance or None if not found
@@ -43,7 +131,7 @@ class BaseRepository(Generic[T]):
         response = (
             self.supabase.table(self.table_name)
             .select("*")
-            .eq("id", str(id))
+            .eq("id", _id_str(id))
             .maybe_single()
             .execute()
         )
@@ -62,12 +150,9 @@ class BaseRepository(Generic[T]):
         Returns:
             Created model instance with generated ID
         """
-        # Convert Pydantic model to dict, excluding None values
-        insert_data = data.model_dump(exclude_none=True)
-
         response = (
             self.supabase.table(self.table_name)
-            .insert(insert_data)
+            .insert(self._insert_payload(data))
             .execute()
         )
 
@@ -76,24 +161,48 @@ class BaseRepository(Generic[T]):
 
         return self.model_class(**response.data[0])
 
-    def update(self, id: UUID, data: dict) -> T:
+    def create_many(self, items: List[BaseModel]) -> List[T]:
+        """
+        Create several records in a single request.
+
+        Args:
+            items: Pydantic models with data to insert
+
+        Returns:
+            Created model instances, in insert order
+        """
+        if not items:
+            return []
+
+        response = (
+            self.supabase.table(self.table_name)
+            .insert([self._insert_payload(item) for item in items])
+            .execute()
+        )
+
+        if not response.data:
+            raise ValueError(f"Failed to create records in {self.table_name}")
+
+        return [self.model_class(**row) for row in response.data]
+
+    def update(self, id: Union[UUID, str], data: dict) -> T:
         """
         Update a record by ID.
 
+        The dict is sent as-is: callers must leave out fields they do not
+        want to change (a None value sets the column to NULL).
+
         Args:
-            id: Record UUID
+            id: Record UUID (or its string form)
             data: Dictionary of fields to update
 
         Returns:
             Updated model instance
         """
-        # Remove None values
-        update_data = {k: v for k, v in data.items() if v is not None}
-
         response = (
             self.supabase.table(self.table_name)
-            .update(update_data)
-            .eq("id", str(id))
+            .update(data)
+            .eq("id", _id_str(id))
             .execute()
         )
 
@@ -102,14 +211,14 @@ class BaseRepository(Generic[T]):
 
         return self.model_class(**response.data[0])
 
-    def delete(self, id: UUID) -> None:
+    def delete(self, id: Union[UUID, str]) -> None:
         """
         Delete a record by ID.
 
         Args:
-            id: Record UUID
+            id: Record UUID (or its string form)
         """
-        self.supabase.table(self.table_name).delete().eq("id", str(id)).execute()
+        self.supabase.table(self.table_name).delete().eq("id", _id_str(id)).execute()
 
     def list_all(self, limit: int = 100, offset: int = 0) -> List[T]:
         """
@@ -124,24 +233,71 @@ class BaseRepository(Generic[T]):
         """
         response = (
             self.supabase.table(self.table_name)
-            .select("*")
+            .select(self.LIST_COLUMNS)
             .limit(limit)
             .offset(offset)
             .execute()
         )
 
-        return [self.model_class(**row) for row in response.data]
+        return self._to_models(response.data)
+
+    def _after_cursor(self, query, column: str, cursor: str):
+        """
+        Restrict a query ordered by (column DESC, id DESC) to rows after a cursor.
+
+        Keyset condition: column < value OR (column = value AND id < last_id),
+        which Postgres answers with an index range scan instead of skipping
+        OFFSET rows.
+
+        Args:
+            query: PostgREST query builder
+            column: Primary sort column
+            cursor: Cursor encoding (column value, id) of the last row seen
+
+        Returns:
+            Filtered query builder
+        """
+        value, last_id = decode_cursor(cursor, 2)
+        if '"' in value or "\\" in value:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        last_id = str(UUID(last_id))
+
+        return query.or_(
+            f'{column}.lt."{value}",and({column}.eq."{value}",id.lt.{last_id})'
+        )
+
+    @staticmethod
+    def _keyset_order(query, column: str):
+        """
+        Order a query by (column DESC, id DESC), the order _after_cursor expects.
+
+        Both keys go in a single order param: postgrest-py sends each
+        .order() call as its own param, and PostgREST honours only one, which
+        would drop the id tie-breaker.
+
+        Args:
+            query: PostgREST query builder
+            column: Primary sort column
+
+        Returns:
+            Ordered query builder
+        """
+        return query.order(f"{column}.desc,id", desc=True)
 
     def count(self) -> int:
         """
         Count total records in table.
 
+        Only the count is transferred: limit(0) returns no rows, and PostgREST
+        still reports the exact total in the Content-Range header.
+
         Returns:
             Total record count
         """
         response = (
             self.supabase.table(self.table_name)
             .select("id", count="exact")
+            .limit(0)
             .execute()
         )
 
@@ -168,3 +324,94 @@ class BaseRepository(Generic[T]):
             raise ValueError(f"Failed to upsert record in {self.table_name}")
 
         return self.model_class(**response.data[0])
+
+    def _execute_insert_ignore(self, data: dict, on_conflict: str) -> Optional[T]:
+        """
+        Insert a record unless one already exists for the conflict columns.
+
+        Issues a single upsert with ``ON CONFLICT DO NOTHING`` semantics, so
+        an existing row is left untouched.
+
+        Args:
+            data: Data to insert
+            on_conflict: Columns to check for conflict (e.g., "newspaper_id,issue_date")
+
+        Returns:
+            Created model instance, or None if the record already existed
+        """
+        response = (
+            self.supabase.table(self.table_name)
+            .upsert(data, on_conflict=on_conflict, ignore_duplicates=True)
+            .execute()
+        )
+
+        if response.data:
+            return self.model_class(**response.data[0])
+        return None
+
+    @staticmethod
+    def _insert_payload(data: BaseModel) -> dict:
+        """
+        Build an insert payload from a create model.
+
+        Reads the model's fields directly and skips None values. Same result
+        as model_dump(exclude_none=True) for our flat create models, without a
+        pass through Pydantic's serializer.
+
+        Args:
+            data: Pydantic model with data to insert
+
+        Returns:
+            Dictionary of column values
+        """
+        return {
+            name: value
+            for name in type(data).model_fields
+            if (value := getattr(data, name)) is not None
+        }
+
+    def _to_models(self, rows: List[dict], model_class: Optional[Type[BaseModel]] = None) -> List[Any]:
+        """
+        Build model instances from list query rows.
+
+        Args:
+            rows: Rows returned by PostgREST
+            model_class: Model to build (default: the repository's model_class)
+
+        Returns:
+            List of model instances (validated unless trust_rows is set)
+        """
+        model_class = model_class or self.model_class
+        if self.trust_rows:
+            return [model_class.model_construct(**row) for row in rows]
+        # One call into pydantic-core for the whole list, not one per row
+        return _list_adapter(model_class).validate_python(rows)
+
+    def _cached_list(self, key: tuple, load: Callable[[], List[T]]) -> List[T]:
+        """
+        Return a list query result from the TTL cache, loading it on a miss.
+
+        Repository instances are shared across requests (and threads), so
+        cache access is guarded by a lock.
+
+        Args:
+            key: Cache key identifying the query and its arguments
+            load: Callable that runs the query
+
+        Returns:
+            List of model instances (a copy of the cached list)
+        """
+        with self._list_cache_lock:
+            cached = self._list_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        result = load()
+        with self._list_cache_lock:
+            self._list_cache[key] = result
+        return list(result)
+
+    def _clear_list_cache(self) -> None:
+        """Drop all cached list results (call after writes)."""
+        with self._list_cache_lock:
+            self._list_cache.clear()
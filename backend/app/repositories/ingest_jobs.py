@@ -2,20 +2,22 @@
 Ingest job repository for tracking async ingestion operations.
 """
 
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List
 from uuid import UUID
-from supabase import Client
 
 from app.models.db.retrieval import IngestJob, IngestJobCreate, IngestJobUpdate
 from app.repositories.base import BaseRepository
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 
 class IngestJobRepository(BaseRepository[IngestJob]):
     """Repository for ingest job CRUD operations."""
 
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: "Client", trust_rows: bool = False):
         """Initialize ingest job repository."""
-        super().__init__(supabase, "ingest_jobs", IngestJob)
+        super().__init__(supabase, "ingest_jobs", IngestJob, trust_rows=trust_rows)
 
     def get_by_key(self, idempotency_key: str) -> Optional[IngestJob]:
         """
@@ -101,6 +103,9 @@ class IngestJobRepository(BaseRepository[IngestJob]):
         """
         Increment job progress.
 
+        Runs server-side via the increment_ingest_progress function, so the
+        update is atomic and concurrent workers cannot overwrite each other.
+
         Args:
             job_id: Job UUID
             pages_processed: Number of pages processed so far
@@ -110,36 +115,26 @@ class IngestJobRepository(BaseRepository[IngestJob]):
 
         Returns:
             Updated IngestJob instance
+
+        Raises:
+            ValueError: If the job does not exist
         """
-        # Get current job to update progress
-        job = self.get_by_id(job_id)
-        if not job:
+        # Single atomic round-trip; see migrations/002_increment_ingest_progress.sql
+        response = self.supabase.rpc(
+            "increment_ingest_progress",
+            {
+                "job_id": str(job_id),
+                "pages_processed": pages_processed,
+                "pages_total": pages_total,
+                "stage": current_stage,
+                "err": error,
+            },
+        ).execute()
+
+        if not response.data:
             raise ValueError(f"Job {job_id} not found")
 
-        # Update progress object
-        progress = job.progress or {
-            "pages_total": pages_total,
-            "pages_processed": 0,
-            "pages_succeeded": 0,
-            "pages_failed": 0,
-            "current_stage": "initializing",
-            "errors": [],
-        }
-
-        progress["pages_processed"] = pages_processed
-        progress["pages_total"] = pages_total
-        progress["current_stage"] = current_stage
-
-        if error:
-            progress["pages_failed"] = progress.get("pages_failed", 0) + 1
-            errors = progress.get("errors", [])
-            errors.append(error)
-            # Keep only last 10 errors to avoid bloat
-            progress["errors"] = errors[-10:]
-        else:
-            progress["pages_succeeded"] = progress.get("pages_succeeded", 0) + 1
-
-        return self.update_job(job_id, progress=progress)
+        return IngestJob(**response.data[0])
 
     def list_by_status(
         self, status: str, limit: int = 100, offset: int = 0
@@ -165,12 +160,15 @@ class IngestJobRepository(BaseRepository[IngestJob]):
             .execute()
         )
 
-        return [IngestJob(**row) for row in response.data]
+        return self._to_models(response.data)
 
     def list_recent(self, limit: int = 50) -> List[IngestJob]:
         """
         List most recent jobs.
 
+        Not cached: job progress is written by ingestion workers in other
+        processes, and pollers need to see it as it happens.
+
         Args:
             limit: Maximum number of results
 
@@ -185,4 +183,4 @@ class IngestJobRepository(BaseRepository[IngestJob]):
             .execute()
         )
 
-        return [IngestJob(**row) for row in response.data]
+        return self._to_models(response.data)
@@ -3,20 +3,32 @@ Issue repository for managing newspaper issues.
 """
 
 from datetime import date
-from typing import Optional, List
+from threading import Lock
+from typing import TYPE_CHECKING, Dict, Optional, List, Tuple, Union
 from uuid import UUID
-from supabase import Client
+
+from cachetools import TTLCache
 
 from app.models.db.browse import Issue, IssueCreate
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, encode_cursor
+from app.repositories.pages import PageRepository
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 
 class IssueRepository(BaseRepository[Issue]):
     """Repository for issue CRUD operations."""
 
-    def __init__(self, supabase: Client):
+    # Cache for count_all, keyed by newspaper filter
+    COUNT_CACHE_SIZE = 1024
+    COUNT_CACHE_TTL = 300  # seconds
+
+    def __init__(self, supabase: "Client", trust_rows: bool = False):
         """Initialize issue repository."""
-        super().__init__(supabase, "issues", Issue)
+        super().__init__(supabase, "issues", Issue, trust_rows=trust_rows)
+        self._count_cache = TTLCache(maxsize=self.COUNT_CACHE_SIZE, ttl=self.COUNT_CACHE_TTL)
+        self._count_cache_lock = Lock()
 
     def create_or_get(
         self,
@@ -44,12 +56,6 @@ class IssueRepository(BaseRepository[Issue]):
         Returns:
             Issue instance (existing or newly created)
         """
-        # Try to find existing issue
-        existing = self.get_by_newspaper_and_date(newspaper_id, issue_date)
-        if existing:
-            return existing
-
-        # Create new issue
         new_issue = IssueCreate(
             newspaper_id=newspaper_id,
             issue_date=issue_date,
@@ -59,11 +65,33 @@ class IssueRepository(BaseRepository[Issue]):
             metadata=metadata,
         )
 
-        # Use upsert to handle race conditions
-        return self._execute_upsert(
+        # Insert first: one round-trip for new issues, and the unique
+        # constraint handles races. Only look up the row if it already existed.
+        created = self._execute_insert_ignore(
             data=new_issue.model_dump(exclude_none=True),
             on_conflict="newspaper_id,issue_date",
         )
+        if created:
+            self._clear_caches()
+            return created
+
+        existing = self.get_by_newspaper_and_date(newspaper_id, issue_date)
+        if not existing:
+            raise ValueError(
+                f"Failed to create or get issue for newspaper {newspaper_id} on {issue_date}"
+            )
+        return existing
+
+    def delete(self, id: Union[UUID, str]) -> None:
+        """Delete an issue by ID and drop the list and count caches."""
+        super().delete(id)
+        self._clear_caches()
+
+    def _clear_caches(self) -> None:
+        """Drop cached lists and counts after the set of issues changed."""
+        self._clear_list_cache()
+        with self._count_cache_lock:
+            self._count_cache.clear()
 
     def get_by_newspaper_and_date(
         self, newspaper_id: UUID, issue_date: date
@@ -91,6 +119,96 @@ class IssueRepository(BaseRepository[Issue]):
             return Issue(**response.data)
         return None
 
+    def get_many_by_dates(
+        self, newspaper_id: UUID, issue_dates: List[date]
+    ) -> Dict[date, Issue]:
+        """
+        Get a newspaper's issues for several dates in a single query.
+
+        Args:
+            newspaper_id: Parent newspaper UUID
+            issue_dates: Publication dates
+
+        Returns:
+            Dict mapping each date found to its issue (missing dates are
+            left out)
+        """
+        if not issue_dates:
+            return {}
+
+        # Trusted rows keep issue_date as an ISO string, so match on that
+        requested = {str(issue_date): issue_date for issue_date in issue_dates}
+        response = (
+            self.supabase.table(self.table_name)
+            .select("*")
+            .eq("newspaper_id", str(newspaper_id))
+            .in_("issue_date", list(requested))
+            .execute()
+        )
+
+        return {
+            requested[str(issue.issue_date)]: issue
+            for issue in self._to_models(response.data)
+        }
+
+    def get_detail(self, issue_id: UUID) -> Optional[dict]:
+        """
+        Get an issue together with its newspaper and pages in one request.
+
+        Uses PostgREST resource embedding, so Postgres joins newspapers and
+        pages instead of the caller making three round-trips. Pages are
+        ordered by page number and limited to PageRepository.SUMMARY_COLUMNS
+        (no OCR data).
+
+        Args:
+            issue_id: Issue UUID
+
+        Returns:
+            Issue row dict with embedded "newspaper" (dict) and "pages"
+            (list of dicts), or None if not found
+        """
+        response = (
+            self.supabase.table(self.table_name)
+            .select(f"*,newspaper:newspapers(*),pages({PageRepository.SUMMARY_COLUMNS})")
+            .eq("id", str(issue_id))
+            .order("page_number", foreign_table="pages")
+            .maybe_single()
+            .execute()
+        )
+
+        if response.data:
+            return response.data
+        return None
+
+    def count_all(self, newspaper_id: Optional[UUID] = None) -> int:
+        """
+        Count issues, optionally for a single newspaper.
+
+        Uses an exact COUNT with no rows transferred. Results are cached for
+        COUNT_CACHE_TTL seconds per filter; creating or deleting an issue
+        clears the cache.
+
+        Args:
+            newspaper_id: Optional filter by newspaper
+
+        Returns:
+            Number of matching issues
+        """
+        key = str(newspaper_id) if newspaper_id else None
+        with self._count_cache_lock:
+            cached = self._count_cache.get(key)
+        if cached is not None:
+            return cached
+
+        query = self.supabase.table(self.table_name).select("id", count="exact")
+        if newspaper_id:
+            query = query.eq("newspaper_id", str(newspaper_id))
+        total = query.limit(0).execute().count or 0
+
+        with self._count_cache_lock:
+            self._count_cache[key] = total
+        return total
+
     def list_by_newspaper(
         self,
         newspaper_id: UUID,
@@ -107,24 +225,132 @@ class IssueRepository(BaseRepository[Issue]):
             offset: Number of records to skip
             order_desc: If True, newest first; if False, oldest first
 
+        Results are cached for LIST_CACHE_TTL seconds; creating an issue
+        clears the cache.
+
         Returns:
             List of issues
         """
+        key = ("list_by_newspaper", str(newspaper_id), limit, offset, order_desc)
+        return self._cached_list(
+            key,
+            lambda: self._list_by_newspaper(newspaper_id, limit, offset, order_desc),
+        )
+
+    def _list_by_newspaper(
+        self, newspaper_id: UUID, limit: int, offset: int, order_desc: bool
+    ) -> List[Issue]:
+        """Run the list_by_newspaper query against the database."""
         query = (
             self.supabase.table(self.table_name)
             .select("*")
             .eq("newspaper_id", str(newspaper_id))
-            .limit(limit)
-            .offset(offset)
         )
 
+        # id breaks ties between issues of the same date, so pages are stable
         if order_desc:
-            query = query.order("issue_date", desc=True)
+            query = self._keyset_order(query, "issue_date")
         else:
-            query = query.order("issue_date", desc=False)
+            query = query.order("issue_date,id")
 
-        response = query.execute()
-        return [Issue(**row) for row in response.data]
+        response = query.limit(limit).offset(offset).execute()
+        return self._to_models(response.data)
+
+    def list_offset(
+        self, limit: int = 50, offset: int = 0, newspaper_id: Optional[UUID] = None
+    ) -> List[Issue]:
+        """
+        List issues newest first with OFFSET pagination.
+
+        Same order as list_page, (issue_date DESC, id DESC), so clients of
+        the deprecated offset API see consistent pages. Prefer list_page.
+
+        Results are cached for LIST_CACHE_TTL seconds; creating an issue
+        clears the cache.
+
+        Args:
+            limit: Maximum number of results
+            offset: Number of records to skip
+            newspaper_id: Optional filter by newspaper
+
+        Returns:
+            List of issues
+        """
+        key = ("list_offset", str(newspaper_id) if newspaper_id else None, limit, offset)
+        return self._cached_list(
+            key, lambda: self._list_offset(limit, offset, newspaper_id)
+        )
+
+    def _list_offset(
+        self, limit: int, offset: int, newspaper_id: Optional[UUID]
+    ) -> List[Issue]:
+        """Run the list_offset query against the database."""
+        query = self.supabase.table(self.table_name).select(self.LIST_COLUMNS)
+        if newspaper_id:
+            query = query.eq("newspaper_id", str(newspaper_id))
+
+        response = (
+            self._keyset_order(query, "issue_date").limit(limit).offset(offset).execute()
+        )
+        return self._to_models(response.data)
+
+    def list_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        newspaper_id: Optional[UUID] = None,
+    ) -> Tuple[List[Issue], Optional[str]]:
+        """
+        List one page of issues, newest first, using keyset pagination.
+
+        Ordered by (issue_date DESC, id DESC). Instead of an OFFSET, the next
+        page starts after the last row of the previous one, so deep pages
+        cost the same as the first.
+
+        Args:
+            limit: Maximum number of results
+            cursor: Cursor returned with the previous page (None for the first)
+            newspaper_id: Optional filter by newspaper
+
+        Results are cached for LIST_CACHE_TTL seconds; creating an issue
+        clears the cache.
+
+        Returns:
+            Tuple of (issues, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        key = (
+            "list_page",
+            str(newspaper_id) if newspaper_id else None,
+            limit,
+            cursor,
+        )
+        issues = self._cached_list(
+            key, lambda: self._list_page(limit + 1, cursor, newspaper_id)
+        )
+
+        if len(issues) <= limit:
+            return issues, None
+
+        issues = issues[:limit]
+        last = issues[-1]
+        return issues, encode_cursor(last.issue_date, last.id)
+
+    def _list_page(
+        self, limit: int, cursor: Optional[str], newspaper_id: Optional[UUID]
+    ) -> List[Issue]:
+        """Run the list_page query against the database."""
+        query = self.supabase.table(self.table_name).select(self.LIST_COLUMNS)
+
+        if newspaper_id:
+            query = query.eq("newspaper_id", str(newspaper_id))
+        if cursor:
+            query = self._after_cursor(query, "issue_date", cursor)
+
+        response = self._keyset_order(query, "issue_date").limit(limit).execute()
+        return self._to_models(response.data)
 
     def list_by_date_range(
         self,
@@ -158,4 +384,4 @@ class IssueRepository(BaseRepository[Issue]):
             query = query.eq("newspaper_id", str(newspaper_id))
 
         response = query.execute()
-        return [Issue(**row) for row in response.data]
+        return self._to_models(response.data)
@@ -2,20 +2,22 @@
 Newspaper repository for managing newspaper publications.
 """
 
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 from uuid import UUID
-from supabase import Client
 
 from app.models.db.browse import Newspaper, NewspaperCreate
 from app.repositories.base import BaseRepository
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 
 class NewspaperRepository(BaseRepository[Newspaper]):
     """Repository for newspaper CRUD operations."""
 
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: "Client", trust_rows: bool = False):
         """Initialize newspaper repository."""
-        super().__init__(supabase, "newspapers", Newspaper)
+        super().__init__(supabase, "newspapers", Newspaper, trust_rows=trust_rows)
 
     def get_or_create(self, name: str) -> Newspaper:
         """
@@ -65,6 +67,29 @@ class NewspaperRepository(BaseRepository[Newspaper]):
             return Newspaper(**response.data)
         return None
 
+    def get_many_by_names(self, names: List[str]) -> Dict[str, Newspaper]:
+        """
+        Get several newspapers by exact name in a single query.
+
+        Args:
+            names: Newspaper names
+
+        Returns:
+            Dict mapping each name found to its newspaper (missing names
+            are left out)
+        """
+        if not names:
+            return {}
+
+        response = (
+            self.supabase.table(self.table_name)
+            .select("*")
+            .in_("name", list(names))
+            .execute()
+        )
+
+        return {newspaper.name: newspaper for newspaper in self._to_models(response.data)}
+
     def search_by_name(self, name_query: str, limit: int = 10) -> list[Newspaper]:
         """
         Search newspapers by name (case-insensitive partial match).
@@ -84,4 +109,4 @@ class NewspaperRepository(BaseRepository[Newspaper]):
             .execute()
         )
 
-        return [Newspaper(**row) for row in response.data]
+        return self._to_models(response.data)
@@ -2,20 +2,96 @@
 Page repository for managing newspaper pages with OCR data.
 """
 
-from typing import Optional, List
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, Optional, List, Tuple, Union
 from uuid import UUID
-from supabase import Client
 
-from app.models.db.browse import Page, PageCreate, PageOcrUpdate
-from app.repositories.base import BaseRepository
+from cachetools import TLRUCache
+
+from app.models.db.browse import Page, PageCreate, PageOcrUpdate, PageSummary
+from app.repositories.base import BaseRepository, _canonical_id, _id_str, encode_cursor
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 
 class PageRepository(BaseRepository[Page]):
     """Repository for page CRUD operations."""
 
-    def __init__(self, supabase: Client):
+    # List queries skip ocr_version and ocr_meta (JSONB), which PageResponse
+    # never renders; those fields come back as None. Use get_by_id for the
+    # full row.
+    LIST_COLUMNS = (
+        "id,issue_id,page_number,image_path,ocr_text,ocr_confidence,"
+        "ocr_provider,ingestion_status,created_at,updated_at"
+    )
+
+    # Columns of PageSummary: no OCR text or metadata
+    SUMMARY_COLUMNS = "id,issue_id,page_number,image_path,ingestion_status,created_at,updated_at"
+
+    # Read cache for get_by_id and list_by_issue. Pages that finished OCR
+    # rarely change again, so they are kept longer. Only writes made through
+    # this process invalidate entries; the TTLs bound how stale a page
+    # rewritten elsewhere (another worker, re-OCR by ingestion) can be.
+    PAGE_CACHE_SIZE = 10_000
+    PAGE_CACHE_TTL = 60  # seconds
+    COMPLETED_PAGE_CACHE_TTL = 300  # seconds
+
+    def __init__(self, supabase: "Client", trust_rows: bool = False):
         """Initialize page repository."""
-        super().__init__(supabase, "pages", Page)
+        super().__init__(supabase, "pages", Page, trust_rows=trust_rows)
+        self._page_cache = TLRUCache(maxsize=self.PAGE_CACHE_SIZE, ttu=self._page_cache_ttu)
+        self._page_cache_lock = Lock()
+
+    def _page_cache_ttu(self, key: tuple, value: Any, now: float) -> float:
+        """Expiry time for a page cache entry (TLRUCache time-to-use hook)."""
+        if isinstance(value, Page) and value.ingestion_status == "ocr_completed":
+            return now + self.COMPLETED_PAGE_CACHE_TTL
+        return now + self.PAGE_CACHE_TTL
+
+    def _invalidate_page(self, page: Page) -> None:
+        """Drop cached reads that include a page (call after writes)."""
+        with self._page_cache_lock:
+            self._page_cache.pop(("page", _id_str(page.id)), None)
+            for order_by_page_number in (True, False):
+                self._page_cache.pop(
+                    ("list_by_issue", _id_str(page.issue_id), order_by_page_number), None
+                )
+
+    def get_by_id(self, id: Union[UUID, str]) -> Optional[Page]:
+        """
+        Get a single page by ID (cached, see PAGE_CACHE_TTL).
+
+        Args:
+            id: Page UUID (or its string form)
+
+        Returns:
+            Page instance or None if not found
+        """
+        key = ("page", _id_str(id))
+        with self._page_cache_lock:
+            cached = self._page_cache.get(key)
+        if cached is not None:
+            return cached
+
+        page = super().get_by_id(id)
+        if page:
+            with self._page_cache_lock:
+                self._page_cache[key] = page
+        return page
+
+    def update(self, id: Union[UUID, str], data: dict) -> Page:
+        """Update a page by ID and invalidate its cached reads."""
+        page = super().update(id, data)
+        self._invalidate_page(page)
+        return page
+
+    def delete(self, id: Union[UUID, str]) -> None:
+        """Delete a page by ID and drop the read cache."""
+        super().delete(id)
+        # The issue the page belonged to is unknown here
+        with self._page_cache_lock:
+            self._page_cache.clear()
 
     def get_by_issue_and_number(
         self, issue_id: UUID, page_number: int
@@ -43,6 +119,33 @@ class PageRepository(BaseRepository[Page]):
             return Page(**response.data)
         return None
 
+    def get_many_by_issue(
+        self, issue_id: UUID, page_numbers: List[int]
+    ) -> Dict[int, Page]:
+        """
+        Get several pages of an issue by page number in a single query.
+
+        Args:
+            issue_id: Parent issue UUID
+            page_numbers: Page numbers within the issue
+
+        Returns:
+            Dict mapping each page number found to its page (missing page
+            numbers are left out)
+        """
+        if not page_numbers:
+            return {}
+
+        response = (
+            self.supabase.table(self.table_name)
+            .select("*")
+            .eq("issue_id", str(issue_id))
+            .in_("page_number", list(page_numbers))
+            .execute()
+        )
+
+        return {page.page_number: page for page in self._to_models(response.data)}
+
     def create_or_get(
         self,
         issue_id: UUID,
@@ -54,6 +157,7 @@ class PageRepository(BaseRepository[Page]):
         Create new page or get existing one.
 
         Uses UNIQUE constraint (issue_id, page_number) for idempotency.
+        If the page already exists, returns it unchanged.
 
         Args:
             issue_id: Parent issue UUID
@@ -64,12 +168,6 @@ class PageRepository(BaseRepository[Page]):
         Returns:
             Page instance (existing or newly created)
         """
-        # Try to find existing page
-        existing = self.get_by_issue_and_number(issue_id, page_number)
-        if existing:
-            return existing
-
-        # Create new page
         new_page = PageCreate(
             issue_id=issue_id,
             page_number=page_number,
@@ -77,11 +175,55 @@ class PageRepository(BaseRepository[Page]):
             ingestion_status=ingestion_status,
         )
 
-        # Use upsert to handle race conditions
-        return self._execute_upsert(
+        # Insert first: one round-trip for new pages, and the unique
+        # constraint handles races. Only look up the row if it already existed.
+        created = self._execute_insert_ignore(
             data=new_page.model_dump(exclude_none=True),
             on_conflict="issue_id,page_number",
         )
+        if created:
+            self._invalidate_page(created)
+            return created
+
+        existing = self.get_by_issue_and_number(issue_id, page_number)
+        if not existing:
+            raise ValueError(
+                f"Failed to create or get page {page_number} for issue {issue_id}"
+            )
+        return existing
+
+    def bulk_upsert(self, records: List[PageCreate]) -> List[Page]:
+        """
+        Create or overwrite several pages in a single request.
+
+        Unlike create_or_get, a page that already exists for its
+        (issue_id, page_number) is updated with the given values.
+
+        Args:
+            records: Pages to write
+
+        Returns:
+            Written page instances
+        """
+        if not records:
+            return []
+
+        response = (
+            self.supabase.table(self.table_name)
+            .upsert(
+                [self._insert_payload(record) for record in records],
+                on_conflict="issue_id,page_number",
+            )
+            .execute()
+        )
+
+        if not response.data:
+            raise ValueError(f"Failed to upsert records in {self.table_name}")
+
+        pages = [Page(**row) for row in response.data]
+        for page in pages:
+            self._invalidate_page(page)
+        return pages
 
     def update_ocr(
         self,
@@ -110,13 +252,18 @@ class PageRepository(BaseRepository[Page]):
         """
         update_data = {
             "ocr_text": ocr_text,
-            "ocr_confidence": ocr_confidence,
-            "ocr_provider": ocr_provider,
-            "ocr_version": ocr_version,
-            "ocr_meta": ocr_meta,
             "ingestion_status": ingestion_status,
         }
 
+        if ocr_confidence is not None:
+            update_data["ocr_confidence"] = ocr_confidence
+        if ocr_provider is not None:
+            update_data["ocr_provider"] = ocr_provider
+        if ocr_version is not None:
+            update_data["ocr_version"] = ocr_version
+        if ocr_meta is not None:
+            update_data["ocr_meta"] = ocr_meta
+
         return self.update(page_id, update_data)
 
     def update_status(self, page_id: UUID, status: str) -> Page:
@@ -136,7 +283,7 @@ class PageRepository(BaseRepository[Page]):
         self, issue_id: UUID, order_by_page_number: bool = True
     ) -> List[Page]:
         """
-        List all pages for an issue.
+        List all pages for an issue (cached, see PAGE_CACHE_TTL).
 
         Args:
             issue_id: Parent issue UUID
@@ -145,9 +292,22 @@ class PageRepository(BaseRepository[Page]):
         Returns:
             List of pages
         """
+        key = ("list_by_issue", _id_str(issue_id), order_by_page_number)
+        with self._page_cache_lock:
+            cached = self._page_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        pages = self._list_by_issue(issue_id, order_by_page_number)
+        with self._page_cache_lock:
+            self._page_cache[key] = pages
+        return list(pages)
+
+    def _list_by_issue(self, issue_id: UUID, order_by_page_number: bool) -> List[Page]:
+        """Run the list_by_issue query against the database."""
         query = (
             self.supabase.table(self.table_name)
-            .select("*")
+            .select(self.LIST_COLUMNS)
             .eq("issue_id", str(issue_id))
         )
 
@@ -155,31 +315,114 @@ class PageRepository(BaseRepository[Page]):
             query = query.order("page_number", desc=False)
 
         response = query.execute()
-        return [Page(**row) for row in response.data]
+        return self._to_models(response.data)
+
+    def list_by_issue_lite(self, issue_id: UUID) -> List[PageSummary]:
+        """
+        List page summaries for an issue, ordered by page number.
+
+        Skips the OCR columns, which can be several KB per page. Use
+        get_by_id for a page's OCR text.
+
+        Args:
+            issue_id: Parent issue UUID
+
+        Returns:
+            List of page summaries
+        """
+        response = (
+            self.supabase.table(self.table_name)
+            .select(self.SUMMARY_COLUMNS)
+            .eq("issue_id", str(issue_id))
+            .order("page_number", desc=False)
+            .execute()
+        )
+        return self._to_models(response.data, PageSummary)
+
+    def list_by_issue_ids(self, issue_ids: List[UUID]) -> Dict[UUID, List[Page]]:
+        """
+        List pages for several issues in a single query.
+
+        Use this instead of calling list_by_issue per issue when rendering
+        a list of issues with their pages.
+
+        Args:
+            issue_ids: Parent issue UUIDs
+
+        Returns:
+            Dict mapping each requested issue ID to its pages, ordered by
+            page number (an empty list if the issue has no pages)
+
+        Raises:
+            ValueError: If an issue ID is not a valid UUID
+        """
+        if not issue_ids:
+            return {}
+
+        requested = {_canonical_id(issue_id): issue_id for issue_id in issue_ids}
+        response = (
+            self.supabase.table(self.table_name)
+            .select(self.LIST_COLUMNS)
+            .in_("issue_id", list(requested))
+            .order("page_number", desc=False)
+            .execute()
+        )
+
+        pages_by_issue = {issue_id: [] for issue_id in issue_ids}
+        for page in self._to_models(response.data):
+            pages_by_issue[requested[_canonical_id(page.issue_id)]].append(page)
+        return pages_by_issue
+
+    # Statuses covered by the idx_pages_pending partial index (migration 003)
+    PENDING_STATUSES = ("pending", "ocr_pending", "ocr_failed")
 
     def list_by_status(
-        self, status: str, limit: int = 100, offset: int = 0
-    ) -> List[Page]:
+        self,
+        statuses: Union[str, List[str]],
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Page], Optional[str]]:
         """
-        List pages by ingestion status.
+        List pages by ingestion status, newest first.
 
-        Useful for finding pages that need processing.
+        Useful for finding pages that need processing. Uses keyset
+        pagination over (created_at DESC, id DESC), so each page is an index
+        range scan no matter how far into the results it is. Filtering on a
+        subset of PENDING_STATUSES uses the partial index over those pages
+        only, so polling cost does not grow with the number of finished pages.
 
         Args:
-            status: Ingestion status to filter by
+            statuses: Ingestion status, or list of statuses, to filter by
             limit: Maximum number of results
-            offset: Number of records to skip
+            cursor: Cursor returned with the previous page (None for the first)
 
         Returns:
-            List of pages with matching status
+            Tuple of (pages, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
         """
-        response = (
+        if isinstance(statuses, str):
+            statuses = [statuses]
+
+        query = (
             self.supabase.table(self.table_name)
-            .select("*")
-            .eq("ingestion_status", status)
-            .limit(limit)
-            .offset(offset)
+            .select(self.LIST_COLUMNS)
+            .in_("ingestion_status", list(statuses))
+        )
+        if cursor:
+            query = self._after_cursor(query, "created_at", cursor)
+
+        response = (
+            self._keyset_order(query, "created_at")
+            .limit(limit + 1)  # Fetch one extra to check if there are more
             .execute()
         )
+        pages = self._to_models(response.data)
+
+        if len(pages) <= limit:
+            return pages, None
 
-        return [Page(**row) for row in response.data]
+        pages = pages[:limit]
+        last = pages[-1]
+        return pages, encode_cursor(last.created_at, last.id)
@@ -0,0 +1,72 @@
+"""
+HTTP caching helpers for browse routes.
+
+ETag / If-None-Match support so clients and CDNs can revalidate a cached
+response and get an empty 304 instead of the full body.
+"""
+
+import hashlib
+from typing import Union
+
+from fastapi import Request, Response
+
+
+# Browse data changes rarely; let caches reuse a response for a minute
+# before revalidating it.
+CACHE_CONTROL = "public, max-age=60"
+
+
+def content_etag(content: Union[str, bytes]) -> str:
+    """
+    Build a strong ETag from a response body.
+
+    Args:
+        content: Serialized response body
+
+    Returns:
+        Quoted ETag value
+    """
+    if isinstance(content, str):
+        content = content.encode()
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the request's If-None-Match header matches an ETag.
+
+    Comparison is weak (RFC 9110): a W/ prefix on either side is ignored.
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client already has this version
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """Build an empty 304 Not Modified response for an ETag."""
+    return Response(status_code=304, headers=_cache_headers(etag))
+
+
+def json_response(content: Union[str, bytes], etag: str) -> Response:
+    """Build a JSON response carrying ETag and Cache-Control headers."""
+    return Response(content=content, media_type="application/json", headers=_cache_headers(etag))
+
+
+def _cache_headers(etag: str) -> dict:
+    """Caching headers sent with both 200 and 304 responses."""
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
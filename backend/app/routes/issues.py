@@ -4,35 +4,66 @@ Browse API routes for newspaper issues.
 Read-only endpoints for browsing issues. Does not touch retrieval tables.
 """
 
+import logging
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
 
-from app.dependencies import (
-    get_issue_repository,
-    get_newspaper_repository,
-    get_page_repository,
-)
+from app.dependencies import get_issue_repository
 from app.repositories.issues import IssueRepository
-from app.repositories.newspapers import NewspaperRepository
-from app.repositories.pages import PageRepository
 from app.models.api.responses import (
     IssueResponse,
     IssueDetailResponse,
     PaginatedIssuesResponse,
-    NewspaperResponse,
-    PageResponse,
 )
+from app.routes.http_cache import content_etag, etag_matches, json_response, not_modified
+
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/issues", tags=["issues"])
 
 
-@router.get("", response_model=PaginatedIssuesResponse)
+def _prefetch_next_page(
+    issue_repo: IssueRepository,
+    limit: int,
+    cursor: Optional[str],
+    offset: int,
+    newspaper_id: Optional[UUID],
+) -> None:
+    """
+    Load the next page of issues into the repository's list cache.
+
+    Runs as a background task after the current page has been sent, so a
+    client paging forward is served from memory. Failures are only logged:
+    the next request simply queries the database itself.
+    """
+    try:
+        if cursor:
+            issue_repo.list_page(limit=limit, cursor=cursor, newspaper_id=newspaper_id)
+        else:
+            # Same lookahead row as list_issues, so the request hits this entry
+            issue_repo.list_offset(limit=limit + 1, offset=offset, newspaper_id=newspaper_id)
+    except Exception:
+        logger.warning("Prefetching the next page of issues failed", exc_info=True)
+
+
+@router.get(
+    "",
+    response_model=PaginatedIssuesResponse,
+    response_model_exclude_none=True,
+)
 def list_issues(
+    background_tasks: BackgroundTasks,
     limit: int = Query(default=50, ge=1, le=100, description="Number of results to return"),
-    offset: int = Query(default=0, ge=0, description="Number of results to skip"),
+    cursor: Optional[str] = Query(default=None, description="Cursor from a previous page's next_cursor"),
+    offset: int = Query(
+        default=0,
+        ge=0,
+        deprecated=True,
+        description="Number of results to skip (deprecated: use cursor)",
+    ),
     newspaper_id: Optional[UUID] = Query(default=None, description="Filter by newspaper ID"),
     issue_repo: IssueRepository = Depends(get_issue_repository),
 ):
@@ -41,45 +72,78 @@ def list_issues(
 
     Query Parameters:
     - limit: Number of results (1-100, default 50)
-    - offset: Number to skip for pagination
+    - cursor: Opaque cursor from the previous response's next_cursor
+    - offset: Deprecated - number to skip for pagination (not with cursor)
     - newspaper_id: Optional filter by newspaper
 
-    Returns paginated list of issues ordered by date descending.
+    Returns paginated list of issues ordered by date descending. The total
+    is included on the first page and on offset requests only. When more
+    results follow, the next page is prefetched into the cache after the
+    response is sent.
     """
-    if newspaper_id:
-        # Filter by newspaper
-        issues = issue_repo.list_by_newspaper(
-            newspaper_id=newspaper_id,
-            limit=limit + 1,  # Fetch one extra to check if there are more
-            offset=offset,
-            order_desc=True,
+    if cursor and offset:
+        raise HTTPException(status_code=400, detail="Use either cursor or offset, not both")
+
+    # Exact total, cached per filter in the repository and only reported:
+    # it can lag inserts made by other processes, so has_more always comes
+    # from fetching one extra row. Later cursor pages skip it.
+    total = issue_repo.count_all(newspaper_id) if offset or not cursor else None
+
+    if offset:
+        # Legacy offset pagination, kept for existing clients, in the same
+        # order as list_page. Fetch one extra row to check if there are more.
+        items = issue_repo.list_offset(
+            limit=limit + 1, offset=offset, newspaper_id=newspaper_id
         )
+        has_more = len(items) > limit
+        items = items[:limit]
+        next_cursor = None
     else:
-        # Get all issues
-        issues = issue_repo.list_all(limit=limit + 1, offset=offset)
-
-    # Check if there are more results
-    has_more = len(issues) > limit
-    items = issues[:limit]  # Return only requested limit
-
-    # Count total (approximation for now - could be optimized with COUNT query)
-    total = offset + len(items) + (1 if has_more else 0)
+        try:
+            items, next_cursor = issue_repo.list_page(
+                limit=limit, cursor=cursor, newspaper_id=newspaper_id
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        has_more = next_cursor is not None
+
+    if has_more:
+        background_tasks.add_task(
+            _prefetch_next_page,
+            issue_repo,
+            limit,
+            next_cursor,
+            offset + limit,
+            newspaper_id,
+        )
 
-    return PaginatedIssuesResponse(
+    result = PaginatedIssuesResponse(
         items=[IssueResponse.model_validate(issue) for issue in items],
         total=total,
         limit=limit,
         offset=offset,
         has_more=has_more,
+        next_cursor=next_cursor,
+    )
+
+    # Already validated above: serialize directly instead of letting FastAPI
+    # re-validate against response_model and run jsonable_encoder. Null
+    # fields are left out of the payload.
+    return Response(
+        content=result.model_dump_json(exclude_none=True),
+        media_type="application/json",
     )
 
 
-@router.get("/{issue_id}", response_model=IssueDetailResponse)
+@router.get(
+    "/{issue_id}",
+    response_model=IssueDetailResponse,
+    response_model_exclude_none=True,
+)
 def get_issue_detail(
     issue_id: UUID,
+    request: Request,
     issue_repo: IssueRepository = Depends(get_issue_repository),
-    newspaper_repo: NewspaperRepository = Depends(get_newspaper_repository),
-    page_repo: PageRepository = Depends(get_page_repository),
 ):
     """
     Get detailed issue information.
@@ -89,26 +153,26 @@ def get_issue_detail(
     - Newspaper information
     - All pages for this issue
 
+    Fetched in a single request with the newspaper and pages embedded.
+    Issues and newspapers have no updated_at column, so the ETag is a hash
+    of the response body; a matching If-None-Match gets an empty 304.
     This endpoint only queries browse tables (newspapers, issues, pages).
     No retrieval tables are touched.
     """
-    # Get issue
-    issue = issue_repo.get_by_id(issue_id)
-    if not issue:
+    detail = issue_repo.get_detail(issue_id)
+    if not detail:
         raise HTTPException(status_code=404, detail="Issue not found")
 
-    # Get newspaper
-    newspaper = newspaper_repo.get_by_id(issue.newspaper_id)
-    if not newspaper:
+    if not detail.get("newspaper"):
         raise HTTPException(
             status_code=500, detail="Associated newspaper not found"
         )
 
-    # Get pages for this issue
-    pages = page_repo.list_by_issue(issue_id, order_by_page_number=True)
+    result = IssueDetailResponse.model_validate(detail)
+    content = result.model_dump_json(exclude_none=True)
 
-    return IssueDetailResponse(
-        **issue.model_dump(),
-        newspaper=NewspaperResponse.model_validate(newspaper),
-        pages=[PageResponse.model_validate(page) for page in pages],
-    )
+    etag = content_etag(content)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    return json_response(content, etag)
@@ -6,19 +6,25 @@ Read-only endpoints for browsing individual pages. Does not touch retrieval tabl
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 
 from app.dependencies import get_page_repository
 from app.repositories.pages import PageRepository
 from app.models.api.responses import PageResponse
+from app.routes.http_cache import etag_matches, json_response, not_modified
 
 
 router = APIRouter(prefix="/api/pages", tags=["pages"])
 
 
-@router.get("/{page_id}", response_model=PageResponse)
+@router.get(
+    "/{page_id}",
+    response_model=PageResponse,
+    response_model_exclude_none=True,
+)
 def get_page_detail(
     page_id: UUID,
+    request: Request,
     page_repo: PageRepository = Depends(get_page_repository),
 ):
     """
@@ -29,6 +35,9 @@ def get_page_detail(
     - OCR text (if available)
     - OCR metadata (confidence, provider, status)
 
+    The ETag follows the page's updated_at, so a matching If-None-Match
+    gets a 304 without serializing the page.
+
     This endpoint only queries the pages table (browse context).
     No retrieval tables are touched.
     """
@@ -37,4 +46,13 @@ def get_page_detail(
     if not page:
         raise HTTPException(status_code=404, detail="Page not found")
 
-    return PageResponse.model_validate(page)
+    etag = f'W/"{page.updated_at.timestamp()}"'
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    result = PageResponse.model_validate(page)
+
+    # Already validated above: serialize directly instead of letting FastAPI
+    # re-validate against response_model and run jsonable_encoder. Null
+    # fields are left out of the payload.
+    return json_response(result.model_dump_json(exclude_none=True), etag)
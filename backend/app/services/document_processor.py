@@ -1,91 +1,358 @@
 """
 Document processor service for converting PDFs to images.
 
-Uses pdf2image to convert PDF pages into individual PNG images.
+Uses PyMuPDF to convert PDF pages into individual images (lossless WebP
+by default).
+
+PNG encoding is mostly deflate work. The default PNG writer is MuPDF's own,
+with its bundled zlib. PNG written through Pillow (an explicit
+compress_level) uses the zlib Pillow was built against; Pillow wheels built
+with zlib-ng (PIL.features.check_feature("zlib_ng"), Pillow >= 11.1) deflate
+roughly twice as fast with no code change here.
 """
 
-from typing import List, Protocol
-from io import BytesIO
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
+from threading import Lock
+from typing import Iterator, List, Optional, Protocol
 
-from pdf2image import convert_from_bytes
+import fitz
 from PIL import Image
 
+try:
+    import fpnge
+except ImportError:  # optional SIMD PNG encoder
+    fpnge = None
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:  # optional OpenCV PNG encoder
+    cv2 = None
+
+
+# Worker pool shared by all processors, created on first multi-page PDF so
+# worker start-up is paid once per process rather than once per document.
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """
+    Get the shared page rendering process pool.
+
+    Workers are spawned rather than forked: the API process runs threads,
+    and MuPDF state must not be copied from a parent mid-render.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _render_page(
+    pdf_bytes: bytes,
+    page_index: int,
+    dpi: int,
+    image_format: str,
+    compress_level: Optional[int] = None,
+    encoder: Optional[str] = None,
+) -> bytes:
+    """
+    Render one PDF page to image bytes.
+
+    Opens its own document handle so it can run in a worker process
+    (a fitz.Document cannot be shared across processes).
+
+    Args:
+        pdf_bytes: Raw PDF file bytes
+        page_index: Zero-based page index
+        dpi: Render resolution
+        image_format: Output image format, upper case (PNG, JPEG, ...)
+        compress_level: PNG zlib level (see _encode)
+        encoder: PNG encoder override (see _encode)
+
+    Returns:
+        Encoded image bytes
+    """
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        # PDF user space is 72 units per inch
+        zoom = dpi / 72
+        pixmap = doc.load_page(page_index).get_pixmap(
+            matrix=fitz.Matrix(zoom, zoom), alpha=False
+        )
+        return _encode(pixmap, image_format, compress_level, encoder)
+    finally:
+        doc.close()
+
+
+def _encode(
+    pixmap: "fitz.Pixmap",
+    image_format: str,
+    compress_level: Optional[int] = None,
+    encoder: Optional[str] = None,
+) -> bytes:
+    """
+    Encode a rendered page in the given image format.
+
+    PNG is written by MuPDF straight from the pixmap unless a zlib
+    compress_level is given, in which case Pillow writes it at that level.
+    With encoder="fpnge" and the fpnge package installed, PNG is written by
+    fpnge (SIMD, several times faster than zlib) from the pixmap's sample
+    buffer without a copy. encoder="opencv" likewise hands the buffer to
+    OpenCV's libpng writer (at compress_level, default 1). Without the
+    package either one falls back as above.
+    Formats MuPDF cannot write (e.g. WebP, JPEG) go through Pillow. WebP is
+    encoded lossless with the fastest method: scanned pages still come out
+    several times smaller than PNG. JPEG skips the extra optimize pass.
+
+    Args:
+        pixmap: Rendered page
+        image_format: Output image format, upper case (PNG, WEBP, ...)
+        compress_level: PNG zlib level 0-9 (None: MuPDF's writer)
+        encoder: "fpnge" or "opencv" to use that PNG encoder when available
+
+    Returns:
+        Encoded image bytes
+    """
+    if image_format == "PNG":
+        if encoder == "fpnge" and fpnge is not None:
+            return fpnge.fromview(pixmap.samples_mv, pixmap.width, pixmap.height, pixmap.n)
+        if encoder == "opencv" and cv2 is not None:
+            return _encode_png_opencv(pixmap, 1 if compress_level is None else compress_level)
+        if compress_level is None:
+            return pixmap.tobytes("png")
+        return pixmap.pil_tobytes(format="PNG", compress_level=compress_level, optimize=False)
+    if image_format == "WEBP":
+        return pixmap.pil_tobytes(format="WEBP", lossless=True, method=0)
+    if image_format == "JPEG":
+        return pixmap.pil_tobytes(format="JPEG", quality=85, optimize=False)
+    return pixmap.pil_tobytes(format=image_format)
+
+
+def _encode_png_opencv(pixmap: "fitz.Pixmap", compress_level: int) -> bytes:
+    """
+    Encode a rendered page as PNG with OpenCV.
+
+    Args:
+        pixmap: Rendered RGB page
+        compress_level: PNG zlib level 0-9
+
+    Returns:
+        PNG bytes
+    """
+    # A view of the pixmap's samples, not a copy
+    pixels = np.frombuffer(pixmap.samples_mv, dtype=np.uint8).reshape(
+        pixmap.height, pixmap.width, pixmap.n
+    )
+    ok, encoded = cv2.imencode(
+        ".png",
+        cv2.cvtColor(pixels, cv2.COLOR_RGB2BGR),
+        [cv2.IMWRITE_PNG_COMPRESSION, compress_level],
+    )
+    if not ok:
+        raise ValueError("OpenCV failed to encode page as PNG")
+    return encoded.tobytes()
+
 
 class DocumentProcessor(Protocol):
     """Protocol for document processing services."""
 
-    def process(self, file_bytes: bytes) -> List[bytes]:
+    def process(self, file_bytes: bytes) -> Iterator[bytes]:
         """
-        Convert document to list of page images.
+        Convert document to page images, yielding them one at a time.
 
         Args:
             file_bytes: Raw document bytes (PDF)
 
-        Returns:
-            List of image bytes (one per page), in PNG format
+        Yields:
+            Image bytes for each page, in page order
         """
         ...
 
 
 class PdfDocumentProcessor:
     """
-    PDF document processor using pdf2image.
+    PDF document processor using PyMuPDF.
+
+    Converts PDF files into individual page images (lossless WebP by
+    default). Pages are rendered by MuPDF: no Poppler subprocess, no temporary
+    files. Multi-page documents are rendered in parallel, one page per
+    task, on a shared process pool.
 
-    Converts PDF files into individual page images (PNG format).
+    Pages are yielded as they are ready, so callers can upload each one
+    and let it be freed instead of holding the whole document in memory.
     """
 
-    def __init__(self, dpi: int = 300, image_format: str = "PNG"):
+    def __init__(
+        self,
+        dpi: int = 300,
+        image_format: str = "WEBP",
+        compress_level: Optional[int] = None,
+        encoder: Optional[str] = None,
+    ):
         """
         Initialize PDF document processor.
 
         Args:
             dpi: Resolution for image conversion (default 300)
-            image_format: Output image format (default PNG)
+            image_format: Output image format (default WEBP, case-insensitive)
+            compress_level: PNG zlib level 0-9. Default None uses MuPDF's own
+                PNG writer, which is faster than Pillow at any level on our
+                pages; set a level to trade encode time for file size.
+            encoder: PNG encoder override. "fpnge" or "opencv" use that
+                optional package when it is installed, otherwise the default
+                writer.
+
+        Raises:
+            ValueError: If compress_level is combined with encoder="fpnge",
+                which has no zlib level to set
         """
+        if encoder == "fpnge" and compress_level is not None:
+            raise ValueError("compress_level cannot be used with encoder='fpnge'")
+
         self.dpi = dpi
-        self.image_format = image_format
+        # Normalized once here rather than per page in the encoder
+        self.image_format = image_format.upper()
+        self.compress_level = compress_level
+        self.encoder = encoder
 
-    def process(self, file_bytes: bytes) -> List[bytes]:
+    @property
+    def content_type(self) -> str:
+        """MIME type of the produced page images (e.g. for storage uploads)."""
+        Image.init()
+        return Image.MIME[self.image_format]
+
+    def render_page(
+        self, file_bytes: bytes, page_index: int, dpi: Optional[int] = None
+    ) -> bytes:
         """
-        Convert PDF to list of page images.
+        Render a single PDF page, in the calling thread.
+
+        For previews that only need one page: nothing else in the document
+        is rasterized.
 
         Args:
             file_bytes: Raw PDF file bytes
+            page_index: Zero-based page index
+            dpi: Render resolution for this call (default: self.dpi)
 
         Returns:
-            List of image bytes (one per page), in PNG format
+            Image bytes for the page, in image_format
 
         Raises:
-            Exception: If PDF conversion fails
+            Exception: If the page cannot be rendered
+        """
+        try:
+            return _render_page(
+                file_bytes,
+                page_index,
+                dpi=dpi or self.dpi,
+                image_format=self.image_format,
+                compress_level=self.compress_level,
+                encoder=self.encoder,
+            )
+        except Exception as e:
+            raise Exception(f"Failed to process PDF: {str(e)}") from e
+
+    def process(self, file_bytes: bytes, dpi: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Convert PDF to page images, yielding them one at a time.
+
+        At most one page per pool worker is rendered ahead of the consumer,
+        so memory use stays bounded however long the document is.
+
+        Args:
+            file_bytes: Raw PDF file bytes
+            dpi: Render resolution for this call (default: self.dpi), e.g.
+                a lower one for previews than for OCR
+
+        Yields:
+            Image bytes for each page, in page order, in image_format
+
+        Raises:
+            Exception: If PDF conversion fails (raised while iterating)
         """
         try:
-            # Convert PDF bytes to list of PIL Images
-            images = convert_from_bytes(
+            doc = fitz.open(stream=file_bytes, filetype="pdf")
+            try:
+                page_count = doc.page_count
+            finally:
+                doc.close()
+
+            render = partial(
+                _render_page,
                 file_bytes,
-                dpi=self.dpi,
-                fmt=self.image_format.lower(),
+                dpi=dpi or self.dpi,
+                image_format=self.image_format,
+                compress_level=self.compress_level,
+                encoder=self.encoder,
             )
 
-            # Convert PIL Images to bytes
-            page_images = []
-            for image in images:
-                image_buffer = BytesIO()
-                image.save(image_buffer, format=self.image_format)
-                image_buffer.seek(0)
-                page_images.append(image_buffer.getvalue())
+            # Not worth a round-trip through the pool for a single page
+            if page_count <= 1:
+                for page_index in range(page_count):
+                    yield render(page_index)
+                return
 
-            return page_images
+            executor = _get_executor()
+            page_indexes = iter(range(page_count))
+            pending = deque(
+                executor.submit(render, page_index)
+                for page_index in islice(page_indexes, os.cpu_count())
+            )
+            try:
+                while pending:
+                    page_bytes = pending.popleft().result()
+                    for page_index in islice(page_indexes, 1):
+                        pending.append(executor.submit(render, page_index))
+                    yield page_bytes
+            finally:
+                # Consumer stopped early or a page failed
+                for future in pending:
+                    future.cancel()
 
         except Exception as e:
             raise Exception(f"Failed to process PDF: {str(e)}") from e
 
+    def process_list(self, file_bytes: bytes, dpi: Optional[int] = None) -> List[bytes]:
+        """
+        Convert PDF to a list of page images.
+
+        Holds every page in memory at once; prefer iterating process().
+
+        Args:
+            file_bytes: Raw PDF file bytes
+            dpi: Render resolution for this call (default: self.dpi)
+
+        Returns:
+            List of image bytes (one per page), in image_format
+
+        Raises:
+            Exception: If PDF conversion fails
+        """
+        return list(self.process(file_bytes, dpi))
+
 
 # Factory function for dependency injection
+@lru_cache()
 def get_document_processor() -> PdfDocumentProcessor:
     """
-    Get document processor instance.
+    Get document processor instance (cached).
+
+    The processor holds only its settings, so one instance can serve every
+    request.
 
     Returns:
-        PdfDocumentProcessor configured with default settings
+        PdfDocumentProcessor configured with default settings (shared instance)
     """
-    return PdfDocumentProcessor(dpi=300, image_format="PNG")
+    return PdfDocumentProcessor(dpi=300, image_format="WEBP")
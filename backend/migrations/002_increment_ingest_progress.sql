@@ -0,0 +1,49 @@
+-- Time Browser - Atomic ingest job progress updates
+-- Moves the read-modify-write of ingest_jobs.progress into the database so a
+-- page update is a single round-trip and concurrent workers cannot lose updates.
+
+-- ============================================================================
+-- INGEST JOB PROGRESS
+-- ============================================================================
+
+-- Record one processed page on an ingest job.
+-- Mirrors IngestJobRepository.increment_progress:
+-- - pages_processed, pages_total and current_stage are overwritten
+-- - pages_succeeded or pages_failed is incremented depending on err
+-- - err (if any) is appended to errors, keeping only the last 10
+-- Returns the updated row (empty set if the job does not exist).
+CREATE OR REPLACE FUNCTION increment_ingest_progress(
+    job_id UUID,
+    pages_processed INT,
+    pages_total INT,
+    stage TEXT DEFAULT 'processing',
+    err TEXT DEFAULT NULL
+)
+RETURNS SETOF ingest_jobs AS $$
+    UPDATE ingest_jobs
+    SET progress = COALESCE(progress, '{}'::jsonb) || jsonb_build_object(
+        'pages_total', increment_ingest_progress.pages_total,
+        'pages_processed', increment_ingest_progress.pages_processed,
+        'current_stage', stage,
+        'pages_succeeded', COALESCE((progress->>'pages_succeeded')::INT, 0)
+            + CASE WHEN NULLIF(err, '') IS NULL THEN 1 ELSE 0 END,
+        'pages_failed', COALESCE((progress->>'pages_failed')::INT, 0)
+            + CASE WHEN NULLIF(err, '') IS NULL THEN 0 ELSE 1 END,
+        'errors', CASE
+            WHEN NULLIF(err, '') IS NULL THEN COALESCE(progress->'errors', '[]'::jsonb)
+            ELSE (
+                SELECT COALESCE(jsonb_agg(e ORDER BY ord), '[]'::jsonb)
+                FROM (
+                    SELECT e, ord
+                    FROM jsonb_array_elements(
+                        COALESCE(progress->'errors', '[]'::jsonb) || to_jsonb(err)
+                    ) WITH ORDINALITY AS t(e, ord)
+                    ORDER BY ord DESC
+                    LIMIT 10
+                ) AS last_errors
+            )
+        END
+    )
+    WHERE id = job_id
+    RETURNING *;
+$$ LANGUAGE sql;
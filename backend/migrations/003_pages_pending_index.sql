@@ -0,0 +1,15 @@
+-- Time Browser - Partial index for pages awaiting processing
+-- Workers poll PageRepository.list_by_status for non-terminal pages. Those
+-- are a small, shrinking fraction of the table, so index only them: the poll
+-- becomes a short index range scan instead of a walk over every page.
+
+-- ============================================================================
+-- PAGES
+-- ============================================================================
+
+-- Matches list_by_status ordering (created_at DESC, id DESC) for keyset paging.
+-- The planner uses it for any ingestion_status IN (...) filter that is a
+-- subset of the statuses below.
+CREATE INDEX IF NOT EXISTS idx_pages_pending
+    ON pages (created_at DESC, id DESC)
+    WHERE ingestion_status IN ('pending', 'ocr_pending', 'ocr_failed');
@@ -5,6 +5,7 @@ Tests that browse endpoints work with mocked repositories.
 For true integration tests with real Supabase, set up test database credentials.
 """
 
+import asyncio
 from datetime import date
 from uuid import uuid4
 
@@ -15,7 +16,7 @@ import os
 
 # Set test environment variables before importing app
 os.environ["SUPABASE_URL"] = "https://test.supabase.co"
-os.environ["SUPABASE_SERVICE_ROLE_KEY"] = "test-key"
+os.environ["SUPABASE_SERVICE_ROLE_KEY"] = "test.service-role.key"
 os.environ["OPENAI_API_KEY"] = "test-openai-key"
 os.environ["ADMIN_API_KEY"] = "test-admin-key"
 
@@ -28,11 +29,29 @@ from app.dependencies import (
 )
 
 
-# Create test client
-client = TestClient(app)
+async def _wait_for_deferred_init():
+    """Wait until the lifespan's deferred startup task has finished."""
+    await asyncio.wait([app.state.init_task])
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def client():
+    """
+    Create a test client with the application lifespan running (once).
+
+    Waits for deferred startup so it cannot change app.state mid-test.
+    """
+    with TestClient(app) as test_client:
+        test_client.portal.call(_wait_for_deferred_init)
+        yield test_client
+
+
+def override(dependency, instance):
+    """Make a FastAPI dependency return the given instance."""
+    app.dependency_overrides[dependency] = lambda: instance
+
+
+@pytest.fixture(scope="module")
 def mock_data():
     """Create mock data for tests."""
     newspaper_id = uuid4()
@@ -80,43 +99,60 @@ def mock_data():
     }
 
 
+@pytest.fixture(scope="module")
+def shared_repos():
+    """Create mock repositories once and install them as dependency overrides."""
+    repos = {
+        "issue_repo": Mock(),
+        "newspaper_repo": Mock(),
+        "page_repo": Mock(),
+    }
+
+    override(get_issue_repository, repos["issue_repo"])
+    override(get_newspaper_repository, repos["newspaper_repo"])
+    override(get_page_repository, repos["page_repo"])
+
+    yield repos
+
+    # Clear overrides after the module
+    app.dependency_overrides.clear()
+
+
 @pytest.fixture
-def mock_repos(mock_data):
-    """Create mock repositories with configured responses."""
-    # Create mock repositories
-    mock_issue_repo = Mock()
-    mock_newspaper_repo = Mock()
-    mock_page_repo = Mock()
+def mock_repos(shared_repos, mock_data):
+    """Reset the shared mock repositories and configure their responses."""
+    for repo in shared_repos.values():
+        repo.reset_mock(return_value=True, side_effect=True)
+
+    mock_issue_repo = shared_repos["issue_repo"]
+    mock_newspaper_repo = shared_repos["newspaper_repo"]
+    mock_page_repo = shared_repos["page_repo"]
 
     # Configure mock responses
     mock_issue_repo.list_all.return_value = [mock_data["issue"]]
+    mock_issue_repo.list_offset.return_value = [mock_data["issue"]]
     mock_issue_repo.list_by_newspaper.return_value = [mock_data["issue"]]
+    mock_issue_repo.list_page.return_value = ([mock_data["issue"]], None)
+    mock_issue_repo.count_all.return_value = 1
     mock_issue_repo.get_by_id.return_value = mock_data["issue"]
+    mock_issue_repo.get_detail.return_value = {
+        **mock_data["issue"].model_dump(mode="json"),
+        "newspaper": mock_data["newspaper"].model_dump(mode="json"),
+        "pages": [mock_data["page"].model_dump(mode="json")],
+    }
 
     mock_newspaper_repo.get_by_id.return_value = mock_data["newspaper"]
 
     mock_page_repo.list_by_issue.return_value = [mock_data["page"]]
     mock_page_repo.get_by_id.return_value = mock_data["page"]
 
-    # Override FastAPI dependencies
-    app.dependency_overrides[get_issue_repository] = lambda: mock_issue_repo
-    app.dependency_overrides[get_newspaper_repository] = lambda: mock_newspaper_repo
-    app.dependency_overrides[get_page_repository] = lambda: mock_page_repo
-
-    yield {
-        "issue_repo": mock_issue_repo,
-        "newspaper_repo": mock_newspaper_repo,
-        "page_repo": mock_page_repo,
-    }
-
-    # Clear overrides after test
-    app.dependency_overrides.clear()
+    return shared_repos
 
 
 class TestIssuesEndpoints:
     """Test /api/issues endpoints."""
 
-    def test_list_issues(self, mock_repos, mock_data):
+    def test_list_issues(self, client, mock_repos, mock_data):
         """Test GET /api/issues returns paginated list."""
         response = client.get("/api/issues")
 
@@ -132,7 +168,7 @@ class TestIssuesEndpoints:
         assert len(data["items"]) == 1
         assert data["items"][0]["newspaper_id"] == str(mock_data["issue"].newspaper_id)
 
-    def test_list_issues_with_pagination(self, mock_repos):
+    def test_list_issues_with_pagination(self, client, mock_repos):
         """Test GET /api/issues with pagination parameters."""
         response = client.get("/api/issues?limit=10&offset=0")
 
@@ -142,7 +178,7 @@ class TestIssuesEndpoints:
         assert data["limit"] == 10
         assert data["offset"] == 0
 
-    def test_list_issues_with_newspaper_filter(self, mock_repos, mock_data):
+    def test_list_issues_with_newspaper_filter(self, client, mock_repos, mock_data):
         """Test GET /api/issues filtered by newspaper_id."""
         newspaper_id = mock_data["newspaper"].id
 
@@ -152,9 +188,111 @@ class TestIssuesEndpoints:
         data = response.json()
 
         # Verify the filter was used
-        mock_repos["issue_repo"].list_by_newspaper.assert_called_once()
+        mock_repos["issue_repo"].list_page.assert_called_once_with(
+            limit=50, cursor=None, newspaper_id=newspaper_id
+        )
+
+    def test_list_issues_with_cursor(self, client, mock_repos):
+        """Test GET /api/issues passes the cursor through and returns next_cursor."""
+        mock_repos["issue_repo"].list_page.return_value = (
+            mock_repos["issue_repo"].list_page.return_value[0],
+            "next-page",
+        )
+
+        response = client.get("/api/issues?limit=1&cursor=this-page")
+
+        assert response.status_code == 200
+        data = response.json()
+
+        mock_repos["issue_repo"].list_page.assert_any_call(
+            limit=1, cursor="this-page", newspaper_id=None
+        )
+        assert data["next_cursor"] == "next-page"
+        assert data["has_more"] is True
+
+        # The total is only computed for the first page
+        assert "total" not in data
+        mock_repos["issue_repo"].count_all.assert_not_called()
+
+    def test_list_issues_prefetches_next_page(self, client, mock_repos, mock_data):
+        """Test GET /api/issues loads the next page into the cache in the background."""
+        mock_repos["issue_repo"].list_page.side_effect = [
+            ([mock_data["issue"]], "next-page"),
+            ([], None),
+        ]
+
+        response = client.get("/api/issues?limit=1")
+
+        assert response.status_code == 200
+        assert response.json()["next_cursor"] == "next-page"
+        calls = mock_repos["issue_repo"].list_page.call_args_list
+        assert len(calls) == 2
+        assert calls[1].kwargs == {"limit": 1, "cursor": "next-page", "newspaper_id": None}
+
+    def test_list_issues_prefetch_failure_is_ignored(self, client, mock_repos, mock_data):
+        """Test a failing prefetch does not affect the response."""
+        mock_repos["issue_repo"].list_page.side_effect = [
+            ([mock_data["issue"]], "next-page"),
+            RuntimeError("database unavailable"),
+        ]
+
+        response = client.get("/api/issues?limit=1")
+
+        assert response.status_code == 200
+        assert len(response.json()["items"]) == 1
+
+    def test_list_issues_invalid_cursor(self, client, mock_repos):
+        """Test GET /api/issues returns 400 for a malformed cursor."""
+        mock_repos["issue_repo"].list_page.side_effect = ValueError("Invalid cursor")
+
+        response = client.get("/api/issues?cursor=garbage")
+
+        assert response.status_code == 400
+
+    def test_list_issues_with_deprecated_offset(self, client, mock_repos, mock_data):
+        """Test GET /api/issues still supports offset pagination."""
+        mock_repos["issue_repo"].count_all.return_value = 12
+        mock_repos["issue_repo"].list_offset.return_value = [mock_data["issue"]] * 2
+
+        response = client.get("/api/issues?limit=1&offset=10")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["offset"] == 10
+        assert data["total"] == 12
+        assert data["has_more"] is True
+        assert len(data["items"]) == 1
+        # One row beyond the page decides has_more
+        mock_repos["issue_repo"].list_offset.assert_any_call(
+            limit=2, offset=10, newspaper_id=None
+        )
+        # The next page is prefetched with the same lookahead
+        mock_repos["issue_repo"].list_offset.assert_any_call(
+            limit=2, offset=11, newspaper_id=None
+        )
+        mock_repos["issue_repo"].list_all.assert_not_called()
+        mock_repos["issue_repo"].list_page.assert_not_called()
+
+    def test_list_issues_offset_has_more_ignores_stale_total(self, client, mock_repos, mock_data):
+        """Test offset has_more follows the extra row, not a cached total that lags inserts."""
+        # The cached total has not caught up with issues added elsewhere
+        mock_repos["issue_repo"].count_all.return_value = 11
+        mock_repos["issue_repo"].list_offset.return_value = [mock_data["issue"]] * 2
+
+        response = client.get("/api/issues?limit=1&offset=10")
 
-    def test_get_issue_detail(self, mock_repos, mock_data):
+        assert response.status_code == 200
+        assert response.json()["has_more"] is True
+
+    def test_list_issues_rejects_cursor_with_offset(self, client, mock_repos):
+        """Test GET /api/issues returns 400 when both cursor and offset are given."""
+        response = client.get("/api/issues?cursor=this-page&offset=10")
+
+        assert response.status_code == 400
+        mock_repos["issue_repo"].list_page.assert_not_called()
+        mock_repos["issue_repo"].list_offset.assert_not_called()
+
+    def test_get_issue_detail(self, client, mock_repos, mock_data):
         """Test GET /api/issues/{id} returns issue with newspaper and pages."""
         issue_id = mock_data["issue"].id
 
@@ -175,34 +313,44 @@ class TestIssuesEndpoints:
         assert len(data["pages"]) == 1
         assert data["pages"][0]["page_number"] == 1
 
-    def test_get_issue_not_found(self):
-        """Test GET /api/issues/{id} returns 404 for non-existent issue."""
-        fake_id = uuid4()
+        # Page OCR text is left to the page detail endpoint
+        assert "ocr_text" not in data["pages"][0]
+
+        # Verify a single embedded query was used
+        mock_repos["issue_repo"].get_detail.assert_called_once_with(issue_id)
+        mock_repos["newspaper_repo"].get_by_id.assert_not_called()
+        mock_repos["page_repo"].list_by_issue.assert_not_called()
+
+    def test_get_issue_detail_not_modified(self, client, mock_repos, mock_data):
+        """Test GET /api/issues/{id} returns 304 when the ETag still matches."""
+        issue_id = mock_data["issue"].id
+
+        first = client.get(f"/api/issues/{issue_id}")
+        etag = first.headers["etag"]
+
+        response = client.get(f"/api/issues/{issue_id}", headers={"If-None-Match": etag})
 
-        # Override issue repo to return None
-        mock_issue_repo = Mock()
-        mock_issue_repo.get_by_id.return_value = None
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
 
-        # Also override other repos (though they won't be called if issue is not found)
-        mock_newspaper_repo = Mock()
-        mock_page_repo = Mock()
+    def test_get_issue_not_found(self, client, mock_repos):
+        """Test GET /api/issues/{id} returns 404 for non-existent issue."""
+        fake_id = uuid4()
 
-        app.dependency_overrides[get_issue_repository] = lambda: mock_issue_repo
-        app.dependency_overrides[get_newspaper_repository] = lambda: mock_newspaper_repo
-        app.dependency_overrides[get_page_repository] = lambda: mock_page_repo
+        # Issue repo returns None
+        mock_repos["issue_repo"].get_detail.return_value = None
 
         response = client.get(f"/api/issues/{fake_id}")
 
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
 
-        app.dependency_overrides.clear()
-
 
 class TestPagesEndpoints:
     """Test /api/pages endpoints."""
 
-    def test_get_page_detail(self, mock_repos, mock_data):
+    def test_get_page_detail(self, client, mock_repos, mock_data):
         """Test GET /api/pages/{id} returns page details."""
         page_id = mock_data["page"].id
 
@@ -217,27 +365,58 @@ class TestPagesEndpoints:
         assert data["ocr_confidence"] == 0.95
         assert data["ingestion_status"] == "ocr_completed"
 
-    def test_get_page_not_found(self):
+    def test_get_page_detail_omits_null_fields(self, client, mock_repos, mock_data):
+        """Test GET /api/pages/{id} leaves null fields out of the payload."""
+        mock_repos["page_repo"].get_by_id.return_value = mock_data["page"].model_copy(
+            update={"ocr_text": None, "ocr_confidence": None}
+        )
+
+        response = client.get(f"/api/pages/{mock_data['page'].id}")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert "ocr_text" not in data
+        assert "ocr_confidence" not in data
+        assert data["page_number"] == 1
+
+    def test_get_page_detail_etag(self, client, mock_repos, mock_data):
+        """Test GET /api/pages/{id} sends an ETag and honours If-None-Match."""
+        page_id = mock_data["page"].id
+
+        response = client.get(f"/api/pages/{page_id}")
+
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert etag == f'W/"{mock_data["page"].updated_at.timestamp()}"'
+        assert "max-age" in response.headers["cache-control"]
+
+        # Same version - empty 304
+        response = client.get(f"/api/pages/{page_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        # Stale version - full body
+        response = client.get(f"/api/pages/{page_id}", headers={"If-None-Match": 'W/"0.0"'})
+        assert response.status_code == 200
+        assert response.json()["id"] == str(page_id)
+
+    def test_get_page_not_found(self, client, mock_repos):
         """Test GET /api/pages/{id} returns 404 for non-existent page."""
         fake_id = uuid4()
 
-        # Override to return None
-        mock_repo = Mock()
-        mock_repo.get_by_id.return_value = None
-        app.dependency_overrides[get_page_repository] = lambda: mock_repo
+        # Page repo returns None
+        mock_repos["page_repo"].get_by_id.return_value = None
 
         response = client.get(f"/api/pages/{fake_id}")
 
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
 
-        app.dependency_overrides.clear()
-
 
 class TestHealthEndpoints:
     """Test health check endpoints."""
 
-    def test_root_endpoint(self):
+    def test_root_endpoint(self, client):
         """Test GET / returns service info."""
         response = client.get("/")
 
@@ -248,7 +427,7 @@ class TestHealthEndpoints:
         assert data["status"] == "running"
         assert "version" in data
 
-    def test_health_check(self):
+    def test_health_check(self, client):
         """Test GET /health returns healthy status."""
         response = client.get("/health")
 
@@ -257,6 +436,42 @@ class TestHealthEndpoints:
 
         assert data["status"] == "healthy"
 
+    def test_liveness_check(self, client, monkeypatch):
+        """Test GET /health/live returns 200 while deferred startup has not failed."""
+        monkeypatch.setattr(app.state, "startup_failed", False)
+
+        response = client.get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "alive"
+
+    def test_liveness_check_after_failed_startup(self, client, monkeypatch):
+        """Test GET /health/live returns 503 once deferred startup has failed."""
+        monkeypatch.setattr(app.state, "startup_failed", True)
+
+        response = client.get("/health/live")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "startup_failed"
+
+    def test_readiness_check_before_startup(self, client, monkeypatch):
+        """Test GET /health/ready returns 503 until deferred startup finishes."""
+        monkeypatch.setattr(app.state, "ready", False)
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "starting"
+
+    def test_readiness_check_after_startup(self, client, monkeypatch):
+        """Test GET /health/ready returns 200 once deferred startup finishes."""
+        monkeypatch.setattr(app.state, "ready", True)
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
 
 class TestBrowseIndependence:
     """
@@ -265,7 +480,7 @@ class TestBrowseIndependence:
     This test verifies the architectural boundary between browse and retrieval contexts.
     """
 
-    def test_browse_works_without_segments(self, mock_repos, mock_data):
+    def test_browse_works_without_segments(self, client, mock_repos, mock_data):
         """
         Browse endpoints should work even if segments table is empty.
 
@@ -0,0 +1,90 @@
+"""
+Unit tests for dependency helpers.
+
+Tests the orjson encoding hooks installed on the PostgREST HTTP session
+and the Supabase client dependency.
+"""
+
+import json
+from datetime import date
+from uuid import uuid4
+
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.dependencies import (
+    _decode_json_with_orjson,
+    _encode_json_with_orjson,
+    get_supabase_client,
+)
+
+
+def make_client(handler):
+    """Create an httpx client with the orjson request and response hooks."""
+    client = httpx.Client(
+        base_url="http://postgrest.test",
+        headers={"Content-Type": "application/json"},
+        transport=httpx.MockTransport(handler),
+        event_hooks={"response": [_decode_json_with_orjson]},
+    )
+    client.build_request = _encode_json_with_orjson(client.build_request)
+    return client
+
+
+def test_request_json_is_encoded_with_orjson():
+    """Test json= payloads, including UUIDs and dates, are sent as JSON bytes."""
+    job_id = uuid4()
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=[{"id": str(job_id)}])
+
+    with make_client(handler) as client:
+        response = client.request(
+            "POST",
+            "/rpc/increment_ingest_progress",
+            json={"job_id": job_id, "issue_date": date(1920, 1, 15)},
+        )
+
+    request = requests[0]
+    assert json.loads(request.content) == {"job_id": str(job_id), "issue_date": "1920-01-15"}
+    assert request.headers["content-type"] == "application/json"
+    assert response.json() == [{"id": str(job_id)}]
+
+
+def test_request_without_json_is_unchanged():
+    """Test requests without a json= payload are sent as before."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=[])
+
+    with make_client(handler) as client:
+        client.request("GET", "/issues", params={"select": "*"})
+
+    assert requests[0].content == b""
+    assert requests[0].url.params["select"] == "*"
+
+
+def test_get_supabase_client_before_startup_returns_503():
+    """Test requests that arrive before the client exists get a 503."""
+    request = Mock()
+    request.app.state.ready = False
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_supabase_client(request)
+
+    assert exc_info.value.status_code == 503
+
+
+def test_get_supabase_client_after_startup():
+    """Test the shared client is returned once startup has finished."""
+    request = Mock()
+    request.app.state.ready = True
+
+    assert get_supabase_client(request) is request.app.state.supabase
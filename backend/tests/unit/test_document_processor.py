@@ -1,22 +1,24 @@
 """
 Unit tests for document processor service.
 
-Tests PDF to image conversion using pdf2image.
+Tests PDF to image conversion using PyMuPDF.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
+import fitz
 import pytest
-from PIL import Image
+from PIL import Image, features
 
 from app.services.document_processor import PdfDocumentProcessor, get_document_processor
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_pdf_bytes():
     """
-    Create a minimal valid PDF for testing.
+    Create a minimal valid PDF for testing (shared: bytes are immutable).
 
     This creates a simple single-page PDF programmatically.
     """
@@ -84,13 +86,52 @@ startxref
     return pdf_content
 
 
+def make_pixmap(width=100, height=100, color=(255, 255, 255)):
+    """Create a filled RGB pixmap, as returned by page.get_pixmap."""
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, width, height), False)
+    pixmap.set_rect(pixmap.irect, color)
+    return pixmap
+
+
+def make_page(pixmap):
+    """Create a mock fitz page that renders to the given pixmap."""
+    page = Mock()
+    page.get_pixmap.return_value = pixmap
+    return page
+
+
+def make_document(pixmaps=None, pages=None):
+    """Create a mock fitz document whose pages render to the given pixmaps."""
+    if pages is None:
+        pages = [make_page(pixmap) for pixmap in pixmaps]
+
+    doc = MagicMock()
+    doc.page_count = len(pages)
+    doc.load_page.side_effect = pages.__getitem__
+    return doc
+
+
 @pytest.fixture
-def mock_pil_images():
-    """Create mock PIL Images for testing."""
-    # Create simple test images
-    image1 = Image.new("RGB", (100, 100), color="red")
-    image2 = Image.new("RGB", (100, 100), color="blue")
-    return [image1, image2]
+def thread_executor():
+    """
+    Run page rendering on threads instead of the process pool.
+
+    Mocked fitz documents only exist in the test process.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with patch(
+            "app.services.document_processor._get_executor", return_value=executor
+        ):
+            yield executor
+
+
+@pytest.fixture(scope="session")
+def mock_pixmaps():
+    """Create rendered page pixmaps for testing (shared: encoding only reads them)."""
+    # Create simple test pages
+    pixmap1 = make_pixmap(color=(255, 0, 0))
+    pixmap2 = make_pixmap(color=(0, 0, 255))
+    return [pixmap1, pixmap2]
 
 
 class TestPdfDocumentProcessor:
@@ -103,110 +144,324 @@ class TestPdfDocumentProcessor:
         assert processor.dpi == 150
         assert processor.image_format == "JPEG"
 
+        processor = PdfDocumentProcessor(image_format="png")
+        assert processor.image_format == "PNG"
+        assert processor.content_type == "image/png"
+
+        processor = PdfDocumentProcessor(image_format="PNG", compress_level=1, encoder="opencv")
+        assert processor.compress_level == 1
+        assert processor.encoder == "opencv"
+
     def test_initialization_defaults(self):
         """Test processor initialization with default settings."""
         processor = PdfDocumentProcessor()
 
         assert processor.dpi == 300
-        assert processor.image_format == "PNG"
+        assert processor.image_format == "WEBP"
+        assert processor.compress_level is None
+        assert processor.encoder is None
+        assert processor.content_type == "image/webp"
 
-    @patch("app.services.document_processor.convert_from_bytes")
-    def test_process_single_page_pdf(self, mock_convert, sample_pdf_bytes):
+    @patch("app.services.document_processor.fitz.open")
+    def test_process_single_page_pdf(self, mock_open, sample_pdf_bytes):
         """Test processing a single-page PDF."""
-        # Create a mock PIL Image
-        mock_image = Image.new("RGB", (100, 100), color="white")
-        mock_convert.return_value = [mock_image]
+        page = make_page(make_pixmap())
+        doc = make_document(pages=[page])
+        mock_open.return_value = doc
 
         processor = PdfDocumentProcessor()
-        result = processor.process(sample_pdf_bytes)
+        result = processor.process_list(sample_pdf_bytes)
 
-        # Verify convert_from_bytes was called correctly
-        mock_convert.assert_called_once_with(
-            sample_pdf_bytes,
-            dpi=300,
-            fmt="png",
-        )
+        # Verify the PDF was opened from memory and rendered at 300 DPI
+        mock_open.assert_called_with(stream=sample_pdf_bytes, filetype="pdf")
+        page.get_pixmap.assert_called_once()
+        _, kwargs = page.get_pixmap.call_args
+        assert tuple(kwargs["matrix"]) == (300 / 72, 0, 0, 300 / 72, 0, 0)
+        assert kwargs["alpha"] is False
+        assert doc.close.call_count == mock_open.call_count
 
         # Verify result
         assert len(result) == 1
         assert isinstance(result[0], bytes)
         assert len(result[0]) > 0
 
-    @patch("app.services.document_processor.convert_from_bytes")
-    def test_process_multi_page_pdf(self, mock_convert, sample_pdf_bytes, mock_pil_images):
+    @patch("app.services.document_processor.fitz.open")
+    def test_process_multi_page_pdf(
+        self, mock_open, sample_pdf_bytes, mock_pixmaps, thread_executor
+    ):
         """Test processing a multi-page PDF."""
-        mock_convert.return_value = mock_pil_images
+        mock_open.return_value = make_document(mock_pixmaps)
 
         processor = PdfDocumentProcessor()
-        result = processor.process(sample_pdf_bytes)
+        result = processor.process_list(sample_pdf_bytes)
 
         # Verify result has correct number of pages
         assert len(result) == 2
         assert all(isinstance(page_bytes, bytes) for page_bytes in result)
         assert all(len(page_bytes) > 0 for page_bytes in result)
 
-    @patch("app.services.document_processor.convert_from_bytes")
-    def test_process_with_custom_dpi(self, mock_convert, sample_pdf_bytes):
+        # Verify page order is preserved (red page first, then blue)
+        colors = [Image.open(BytesIO(page_bytes)).getpixel((0, 0)) for page_bytes in result]
+        assert colors == [(255, 0, 0), (0, 0, 255)]
+
+    @patch("app.services.document_processor.fitz.open")
+    def test_process_yields_pages_lazily(
+        self, mock_open, sample_pdf_bytes, mock_pixmaps, thread_executor
+    ):
+        """Test process renders pages as they are consumed."""
+        mock_open.return_value = make_document(mock_pixmaps)
+
+        processor = PdfDocumentProcessor()
+        pages = processor.process(sample_pdf_bytes)
+
+        # Nothing is rendered until the caller starts iterating
+        mock_open.assert_not_called()
+
+        first = next(pages)
+        assert Image.open(BytesIO(first)).getpixel((0, 0)) == (255, 0, 0)
+
+        pages.close()
+
+    @patch("app.services.document_processor.fitz.open")
+    def test_process_can_be_consumed_without_keeping_pages(
+        self, mock_open, sample_pdf_bytes, thread_executor
+    ):
+        """Test every page is yielded when the caller drops each one."""
+        pixmaps = [make_pixmap(color=(i, i, i)) for i in range(5)]
+        mock_open.return_value = make_document(pixmaps)
+
+        processor = PdfDocumentProcessor()
+        page_count = sum(1 for _ in processor.process(sample_pdf_bytes))
+
+        assert page_count == 5
+
+    @patch("app.services.document_processor.fitz.open")
+    def test_process_with_custom_dpi(self, mock_open, sample_pdf_bytes):
         """Test processing with custom DPI setting."""
-        mock_image = Image.new("RGB", (200, 200), color="white")
-        mock_convert.return_value = [mock_image]
+        page = make_page(make_pixmap(200, 200))
+        mock_open.return_value = make_document(pages=[page])
 
-        processor = PdfDocumentProcessor(dpi=150)
-        result = processor.process(sample_pdf_bytes)
+        processor = PdfDocumentProcessor(dpi=144)
+        result = processor.process_list(sample_pdf_bytes)
 
-        # Verify DPI was passed correctly
-        mock_convert.assert_called_once_with(
-            sample_pdf_bytes,
-            dpi=150,
-            fmt="png",
-        )
+        # Verify DPI was turned into a 2x zoom matrix
+        _, kwargs = page.get_pixmap.call_args
+        assert tuple(kwargs["matrix"]) == (2, 0, 0, 2, 0, 0)
 
         assert len(result) == 1
 
-    @patch("app.services.document_processor.convert_from_bytes")
-    def test_process_with_jpeg_format(self, mock_convert, sample_pdf_bytes):
+        # A per-call DPI overrides the processor's
+        processor.process_list(sample_pdf_bytes, dpi=72)
+        _, kwargs = page.get_pixmap.call_args
+        assert tuple(kwargs["matrix"]) == (1, 0, 0, 1, 0, 0)
+
+    @patch("app.services.document_processor.fitz.open")
+    def test_render_page(self, mock_open, sample_pdf_bytes):
+        """Test render_page renders only the requested page."""
+        pages = [make_page(make_pixmap(color=color)) for color in ((255, 0, 0), (0, 0, 255))]
+        mock_open.return_value = make_document(pages=pages)
+
+        processor = PdfDocumentProcessor()
+        page_bytes = processor.render_page(sample_pdf_bytes, 1, dpi=144)
+
+        assert Image.open(BytesIO(page_bytes)).getpixel((0, 0)) == (0, 0, 255)
+        pages[0].get_pixmap.assert_not_called()
+        _, kwargs = pages[1].get_pixmap.call_args
+        assert tuple(kwargs["matrix"]) == (2, 0, 0, 2, 0, 0)
+
+    @patch("app.services.document_processor.fitz.open")
+    def test_process_with_jpeg_format(self, mock_open, sample_pdf_bytes):
         """Test processing with JPEG output format."""
-        mock_image = Image.new("RGB", (100, 100), color="white")
-        mock_convert.return_value = [mock_image]
+        mock_open.return_value = make_document([make_pixmap()])
 
         processor = PdfDocumentProcessor(image_format="JPEG")
-        result = processor.process(sample_pdf_bytes)
-
-        # Verify format was passed correctly
-        mock_convert.assert_called_once_with(
-            sample_pdf_bytes,
-            dpi=300,
-            fmt="jpeg",
-        )
+        result = processor.process_list(sample_pdf_bytes)
 
+        # Verify format was used for encoding
         assert len(result) == 1
+        assert Image.open(BytesIO(result[0])).format == "JPEG"
 
-    @patch("app.services.document_processor.convert_from_bytes")
-    def test_process_invalid_pdf(self, mock_convert):
+    @patch("app.services.document_processor.fitz.open")
+    def test_process_invalid_pdf(self, mock_open):
         """Test processing invalid PDF raises exception."""
-        mock_convert.side_effect = Exception("Invalid PDF")
+        mock_open.side_effect = Exception("Invalid PDF")
 
         processor = PdfDocumentProcessor()
 
         with pytest.raises(Exception) as exc_info:
-            processor.process(b"invalid pdf content")
+            processor.process_list(b"invalid pdf content")
 
         assert "Failed to process PDF" in str(exc_info.value)
 
-    @patch("app.services.document_processor.convert_from_bytes")
-    def test_image_bytes_are_valid_png(self, mock_convert, sample_pdf_bytes):
+    @patch("app.services.document_processor.fitz.open")
+    def test_image_bytes_are_valid_png(self, mock_open, sample_pdf_bytes):
         """Test that returned bytes are valid PNG images."""
-        mock_image = Image.new("RGB", (100, 100), color="green")
-        mock_convert.return_value = [mock_image]
+        mock_open.return_value = make_document([make_pixmap(color=(0, 128, 0))])
 
-        processor = PdfDocumentProcessor()
-        result = processor.process(sample_pdf_bytes)
+        processor = PdfDocumentProcessor(image_format="PNG")
+        result = processor.process_list(sample_pdf_bytes)
 
         # Verify the bytes can be loaded as a PNG image
         image_from_bytes = Image.open(BytesIO(result[0]))
         assert image_from_bytes.format == "PNG"
         assert image_from_bytes.size == (100, 100)
 
+    @patch("app.services.document_processor.fitz.open")
+    def test_png_compress_level_is_forwarded(self, mock_open, sample_pdf_bytes):
+        """Test an explicit PNG compress_level encodes through Pillow at that level."""
+        pixmap = Mock()
+        pixmap.pil_tobytes.return_value = b"png"
+        mock_open.return_value = make_document([pixmap])
+
+        processor = PdfDocumentProcessor(image_format="PNG", compress_level=1)
+        result = processor.process_list(sample_pdf_bytes)
+
+        assert result == [b"png"]
+        pixmap.pil_tobytes.assert_called_once_with(
+            format="PNG", compress_level=1, optimize=False
+        )
+        pixmap.tobytes.assert_not_called()
+
+    @patch("app.services.document_processor.fitz.open")
+    def test_png_fpnge_encoder(self, mock_open, sample_pdf_bytes):
+        """Test encoder="fpnge" hands the pixmap samples to fpnge."""
+        pixmap = make_pixmap(20, 10)
+        mock_open.return_value = make_document([pixmap])
+        mock_fpnge = Mock()
+        mock_fpnge.fromview.return_value = b"png"
+
+        processor = PdfDocumentProcessor(image_format="PNG", encoder="fpnge")
+        with patch("app.services.document_processor.fpnge", mock_fpnge):
+            result = processor.process_list(sample_pdf_bytes)
+
+        assert result == [b"png"]
+        view, width, height, channels = mock_fpnge.fromview.call_args.args
+        assert bytes(view) == pixmap.samples
+        assert (width, height, channels) == (20, 10, 3)
+
+    @patch("app.services.document_processor.fitz.open")
+    def test_png_fpnge_encoder_round_trip(self, mock_open, sample_pdf_bytes):
+        """Test fpnge output decodes to the source pixels (needs fpnge installed)."""
+        pytest.importorskip("fpnge")
+        mock_open.return_value = make_document([make_pixmap(20, 10, color=(255, 0, 0))])
+
+        processor = PdfDocumentProcessor(image_format="PNG", encoder="fpnge")
+        result = processor.process_list(sample_pdf_bytes)
+
+        image_from_bytes = Image.open(BytesIO(result[0]))
+        assert image_from_bytes.format == "PNG"
+        assert image_from_bytes.size == (20, 10)
+        assert image_from_bytes.convert("RGB").getcolors() == [(20 * 10, (255, 0, 0))]
+
+    def test_png_fpnge_encoder_rejects_compress_level(self):
+        """Test compress_level cannot be combined with encoder="fpnge"."""
+        with pytest.raises(ValueError):
+            PdfDocumentProcessor(image_format="PNG", compress_level=1, encoder="fpnge")
+
+    @patch("app.services.document_processor.fitz.open")
+    def test_png_fpnge_encoder_falls_back_without_fpnge(self, mock_open, sample_pdf_bytes):
+        """Test encoder="fpnge" still writes PNG when fpnge is not installed."""
+        mock_open.return_value = make_document([make_pixmap(color=(0, 128, 0))])
+
+        processor = PdfDocumentProcessor(image_format="PNG", encoder="fpnge")
+        with patch("app.services.document_processor.fpnge", None):
+            result = processor.process_list(sample_pdf_bytes)
+
+        # Verify the bytes can be loaded as a PNG image
+        image_from_bytes = Image.open(BytesIO(result[0]))
+        assert image_from_bytes.format == "PNG"
+        assert image_from_bytes.getpixel((0, 0)) == (0, 128, 0)
+
+    @patch("app.services.document_processor.fitz.open")
+    def test_png_opencv_encoder(self, mock_open, sample_pdf_bytes):
+        """Test encoder="opencv" encodes the pixmap samples with cv2.imencode."""
+        mock_open.return_value = make_document([make_pixmap(20, 10)])
+        mock_np = MagicMock()
+        mock_cv2 = MagicMock()
+        mock_cv2.imencode.return_value = (True, Mock(**{"tobytes.return_value": b"png"}))
+
+        processor = PdfDocumentProcessor(image_format="PNG", encoder="opencv")
+        with patch("app.services.document_processor.cv2", mock_cv2), patch(
+            "app.services.document_processor.np", mock_np, create=True
+        ):
+            result = processor.process_list(sample_pdf_bytes)
+
+        assert result == [b"png"]
+        mock_np.frombuffer.return_value.reshape.assert_called_once_with(10, 20, 3)
+        mock_cv2.cvtColor.assert_called_once_with(
+            mock_np.frombuffer.return_value.reshape.return_value, mock_cv2.COLOR_RGB2BGR
+        )
+        ext, _, params = mock_cv2.imencode.call_args.args
+        assert ext == ".png"
+        assert params == [mock_cv2.IMWRITE_PNG_COMPRESSION, 1]
+
+    @patch("app.services.document_processor.fitz.open")
+    def test_png_opencv_encoder_round_trip(self, mock_open, sample_pdf_bytes):
+        """Test OpenCV output decodes to the source pixels in RGB order (needs OpenCV)."""
+        pytest.importorskip("cv2")
+        pixmap = make_pixmap(20, 10, color=(255, 0, 0))
+        pixmap.set_rect(fitz.IRect(10, 0, 20, 10), (0, 0, 255))
+        mock_open.return_value = make_document([pixmap])
+
+        processor = PdfDocumentProcessor(image_format="PNG", encoder="opencv")
+        result = processor.process_list(sample_pdf_bytes)
+
+        image_from_bytes = Image.open(BytesIO(result[0]))
+        assert image_from_bytes.format == "PNG"
+        assert image_from_bytes.size == (20, 10)
+        assert image_from_bytes.getpixel((0, 0)) == (255, 0, 0)
+        assert image_from_bytes.getpixel((19, 9)) == (0, 0, 255)
+
+    @patch("app.services.document_processor.fitz.open")
+    def test_png_opencv_encoder_falls_back_without_opencv(self, mock_open, sample_pdf_bytes):
+        """Test encoder="opencv" still writes PNG when OpenCV is not installed."""
+        mock_open.return_value = make_document([make_pixmap(color=(0, 128, 0))])
+
+        processor = PdfDocumentProcessor(image_format="PNG", encoder="opencv")
+        with patch("app.services.document_processor.cv2", None):
+            result = processor.process_list(sample_pdf_bytes)
+
+        image_from_bytes = Image.open(BytesIO(result[0]))
+        assert image_from_bytes.format == "PNG"
+        assert image_from_bytes.getpixel((0, 0)) == (0, 128, 0)
+
+    @patch("app.services.document_processor.fitz.open")
+    def test_jpeg_encoding_options(self, mock_open, sample_pdf_bytes):
+        """Test JPEG is encoded at quality 85 without the optimize pass."""
+        pixmap = Mock()
+        pixmap.pil_tobytes.return_value = b"jpeg"
+        mock_open.return_value = make_document([pixmap])
+
+        processor = PdfDocumentProcessor(image_format="JPEG")
+        processor.process_list(sample_pdf_bytes)
+
+        pixmap.pil_tobytes.assert_called_once_with(format="JPEG", quality=85, optimize=False)
+
+    @patch("app.services.document_processor.fitz.open")
+    def test_image_bytes_are_lossless_webp(self, mock_open, sample_pdf_bytes):
+        """Test that the default output is lossless WebP."""
+        mock_open.return_value = make_document([make_pixmap(color=(0, 128, 0))])
+
+        processor = PdfDocumentProcessor()
+        result = processor.process_list(sample_pdf_bytes)
+
+        # Verify the bytes are WebP and decode to the exact source pixels
+        image_from_bytes = Image.open(BytesIO(result[0]))
+        assert image_from_bytes.format == "WEBP"
+        assert image_from_bytes.size == (100, 100)
+        assert image_from_bytes.convert("RGB").getcolors() == [(100 * 100, (0, 128, 0))]
+
+
+class TestPillowBuild:
+    """Test the Pillow build used for encoding."""
+
+    @pytest.mark.skipif(
+        "zlib_ng" not in features.features, reason="Pillow build does not report zlib-ng"
+    )
+    def test_pillow_uses_zlib_ng(self):
+        """Test Pillow deflates with zlib-ng where the build can report it."""
+        assert features.check_feature("zlib_ng")
+
 
 class TestFactoryFunction:
     """Test factory function for dependency injection."""
@@ -217,36 +472,45 @@ class TestFactoryFunction:
 
         assert isinstance(processor, PdfDocumentProcessor)
         assert processor.dpi == 300
-        assert processor.image_format == "PNG"
+        assert processor.image_format == "WEBP"
+
+    def test_get_document_processor_is_cached(self):
+        """Test factory function returns the same instance on every call."""
+        assert get_document_processor() is get_document_processor()
 
 
 class TestIntegrationWithRealPdf:
     """
     Integration tests with actual PDF processing.
 
-    These tests use the real pdf2image library with a minimal PDF.
+    These tests use the real PyMuPDF library with a minimal PDF.
     """
 
     def test_process_minimal_pdf(self, sample_pdf_bytes):
         """Test processing a real minimal PDF."""
         processor = PdfDocumentProcessor(dpi=72)  # Lower DPI for faster test
 
-        try:
-            result = processor.process(sample_pdf_bytes)
-
-            # Verify we got image bytes back
-            assert len(result) == 1
-            assert isinstance(result[0], bytes)
-
-            # Verify the bytes are a valid image
-            image = Image.open(BytesIO(result[0]))
-            assert image.format == "PNG"
-            assert image.size[0] > 0
-            assert image.size[1] > 0
-
-        except Exception as e:
-            # If poppler is not installed, skip this test
-            if "poppler" in str(e).lower():
-                pytest.skip("Poppler not installed - skipping real PDF test")
-            else:
-                raise
+        result = processor.process_list(sample_pdf_bytes)
+
+        # Verify we got image bytes back
+        assert len(result) == 1
+        assert isinstance(result[0], bytes)
+
+        # Verify the bytes are a valid image at the page size (612x792 pt at 72 DPI)
+        image = Image.open(BytesIO(result[0]))
+        assert image.format == "WEBP"
+        assert image.size == (612, 792)
+
+    def test_process_multi_page_pdf_in_process_pool(self):
+        """Test a real multi-page PDF is rendered in order on the process pool."""
+        doc = fitz.open()
+        for width in (200, 300, 400):
+            doc.new_page(width=width, height=100)
+        pdf_bytes = doc.tobytes()
+        doc.close()
+
+        processor = PdfDocumentProcessor(dpi=72)
+        result = processor.process_list(pdf_bytes)
+
+        sizes = [Image.open(BytesIO(page_bytes)).size for page_bytes in result]
+        assert sizes == [(200, 100), (300, 100), (400, 100)]
@@ -4,11 +4,12 @@ Unit tests for repository layer.
 Tests all repository CRUD operations using mocked Supabase client.
 """
 
-from datetime import date, datetime
+from datetime import date, datetime, timezone
 from uuid import uuid4, UUID
 from unittest.mock import Mock, MagicMock, patch
 
 import pytest
+from postgrest import SyncPostgrestClient, SyncQueryRequestBuilder
 
 from app.models.db.browse import (
     Newspaper,
@@ -17,12 +18,31 @@ from app.models.db.browse import (
     IssueCreate,
     Page,
     PageCreate,
+    PageSummary,
 )
 from app.models.db.retrieval import IngestJob, IngestJobCreate
 from app.repositories.newspapers import NewspaperRepository
 from app.repositories.issues import IssueRepository
 from app.repositories.pages import PageRepository
 from app.repositories.ingest_jobs import IngestJobRepository
+from app.repositories.base import decode_cursor, encode_cursor
+
+
+# Shared row timestamp; no test depends on rows having distinct times
+_NOW = datetime.now(timezone.utc).isoformat()
+
+
+def _make_chain(execute_return):
+    """
+    Create a mock table whose single-row lookups return execute_return.
+
+    Covers select().eq().maybe_single() and select().eq().eq().maybe_single().
+    """
+    table = Mock()
+    eq = table.select.return_value.eq.return_value
+    eq.maybe_single.return_value.execute.return_value = execute_return
+    eq.eq.return_value.maybe_single.return_value.execute.return_value = execute_return
+    return table
 
 
 @pytest.fixture
@@ -31,6 +51,19 @@ def mock_supabase():
     return Mock()
 
 
+@pytest.fixture
+def postgrest_execute(mock_supabase):
+    """
+    Build queries with real postgrest-py builders, but mock sending them.
+
+    Yields the patched execute; the first argument of each call is the
+    built query, whose params are what would go on the wire.
+    """
+    mock_supabase.table.side_effect = SyncPostgrestClient("http://postgrest.test").from_
+    with patch.object(SyncQueryRequestBuilder, "execute", autospec=True) as execute:
+        yield execute
+
+
 @pytest.fixture
 def mock_table_response():
     """Helper to create mock table responses."""
@@ -58,14 +91,11 @@ class TestNewspaperRepository:
             "end_year": 1950,
             "description": "Test newspaper",
             "source_type": "upload",
-            "created_at": datetime.now().isoformat(),
+            "created_at": _NOW,
         }
 
         # Mock the query chain
-        mock_query = Mock()
-        mock_query.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
-            mock_table_response(existing_data)
-        )
+        mock_query = _make_chain(mock_table_response(existing_data))
         mock_supabase.table.return_value = mock_query
 
         # Execute
@@ -90,14 +120,11 @@ class TestNewspaperRepository:
             "end_year": None,
             "description": None,
             "source_type": "upload",
-            "created_at": datetime.now().isoformat(),
+            "created_at": _NOW,
         }
 
-        mock_query = Mock()
         # First call (select) returns None
-        mock_query.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
-            mock_table_response(None)
-        )
+        mock_query = _make_chain(mock_table_response(None))
         # Second call (insert) returns created newspaper
         mock_query.insert.return_value.execute.return_value = mock_table_response([created_data])
         mock_supabase.table.return_value = mock_query
@@ -123,13 +150,10 @@ class TestNewspaperRepository:
             "end_year": None,
             "description": None,
             "source_type": "upload",
-            "created_at": datetime.now().isoformat(),
+            "created_at": _NOW,
         }
 
-        mock_query = Mock()
-        mock_query.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
-            mock_table_response(newspaper_data)
-        )
+        mock_query = _make_chain(mock_table_response(newspaper_data))
         mock_supabase.table.return_value = mock_query
 
         # Execute
@@ -140,6 +164,41 @@ class TestNewspaperRepository:
         assert result is not None
         assert result.name == "Test Paper"
 
+    def test_get_many_by_names_single_query(self, mock_supabase, mock_table_response):
+        """Test get_many_by_names looks up all names in one request."""
+        # Setup
+        rows = [
+            {
+                "id": str(uuid4()),
+                "name": name,
+                "created_at": _NOW,
+                "updated_at": _NOW,
+            }
+            for name in ("The Daily Test", "The Evening Test")
+        ]
+
+        mock_query = Mock()
+        mock_in = mock_query.select.return_value.in_
+        mock_in.return_value.execute.return_value = mock_table_response(rows)
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = NewspaperRepository(mock_supabase)
+        result = repo.get_many_by_names(["The Daily Test", "The Evening Test", "Missing"])
+
+        # Assert
+        mock_in.assert_called_once_with("name", ["The Daily Test", "The Evening Test", "Missing"])
+        mock_in.return_value.execute.assert_called_once()
+        assert set(result) == {"The Daily Test", "The Evening Test"}
+        assert isinstance(result["The Daily Test"], Newspaper)
+
+    def test_get_many_by_names_empty(self, mock_supabase):
+        """Test get_many_by_names with no names makes no request."""
+        repo = NewspaperRepository(mock_supabase)
+
+        assert repo.get_many_by_names([]) == {}
+        mock_supabase.table.assert_not_called()
+
 
 class TestIssueRepository:
     """Test issue repository operations."""
@@ -151,8 +210,7 @@ class TestIssueRepository:
         issue_id = uuid4()
         issue_date = date(1925, 1, 15)
 
-        # First query (select) returns None - issue doesn't exist
-        # Second call (upsert) returns created issue
+        # Upsert (insert-or-ignore) returns the created issue
         created_data = {
             "id": str(issue_id),
             "newspaper_id": str(newspaper_id),
@@ -161,13 +219,10 @@ class TestIssueRepository:
             "source_type": "upload",
             "source_external_id": None,
             "metadata": None,
-            "created_at": datetime.now().isoformat(),
+            "created_at": _NOW,
         }
 
         mock_query = Mock()
-        mock_query.select.return_value.eq.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
-            mock_table_response(None)
-        )
         mock_query.upsert.return_value.execute.return_value = mock_table_response([created_data])
         mock_supabase.table.return_value = mock_query
 
@@ -179,10 +234,49 @@ class TestIssueRepository:
             num_pages=8,
         )
 
-        # Assert
+        # Assert - a single round-trip, no lookup beforehand
         assert isinstance(result, Issue)
         assert result.newspaper_id == newspaper_id
         assert result.num_pages == 8
+        mock_query.upsert.assert_called_once()
+        assert mock_query.upsert.call_args.kwargs["ignore_duplicates"] is True
+        mock_query.select.assert_not_called()
+
+    def test_create_or_get_existing_issue(self, mock_supabase, mock_table_response):
+        """Test create_or_get returns the existing issue on conflict."""
+        # Setup
+        newspaper_id = uuid4()
+        issue_id = uuid4()
+        issue_date = date(1925, 1, 15)
+
+        existing_data = {
+            "id": str(issue_id),
+            "newspaper_id": str(newspaper_id),
+            "issue_date": str(issue_date),
+            "num_pages": 4,
+            "source_type": "upload",
+            "source_external_id": None,
+            "metadata": None,
+            "created_at": _NOW,
+        }
+
+        # Lookup returns the existing issue
+        mock_query = _make_chain(mock_table_response(existing_data))
+        # Upsert ignores the duplicate and returns no rows
+        mock_query.upsert.return_value.execute.return_value = mock_table_response([])
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = IssueRepository(mock_supabase)
+        result = repo.create_or_get(
+            newspaper_id=newspaper_id,
+            issue_date=issue_date,
+            num_pages=8,
+        )
+
+        # Assert - existing row is returned unchanged
+        assert result.id == issue_id
+        assert result.num_pages == 4
 
     def test_get_by_newspaper_and_date(self, mock_supabase, mock_table_response):
         """Test get_by_newspaper_and_date retrieves issue."""
@@ -199,13 +293,10 @@ class TestIssueRepository:
             "source_type": "upload",
             "source_external_id": None,
             "metadata": None,
-            "created_at": datetime.now().isoformat(),
+            "created_at": _NOW,
         }
 
-        mock_query = Mock()
-        mock_query.select.return_value.eq.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
-            mock_table_response(issue_data)
-        )
+        mock_query = _make_chain(mock_table_response(issue_data))
         mock_supabase.table.return_value = mock_query
 
         # Execute
@@ -216,6 +307,248 @@ class TestIssueRepository:
         assert result is not None
         assert result.issue_date == issue_date
 
+    def test_list_by_newspaper_is_cached(self, mock_supabase, mock_table_response):
+        """Test repeated list_by_newspaper calls are served from the cache."""
+        # Setup
+        newspaper_id = uuid4()
+        issue_data = {
+            "id": str(uuid4()),
+            "newspaper_id": str(newspaper_id),
+            "issue_date": "1925-01-15",
+            "num_pages": 8,
+            "source_type": "upload",
+            "source_external_id": None,
+            "metadata": None,
+            "created_at": _NOW,
+        }
+
+        mock_query = Mock()
+        mock_execute = (
+            mock_query.select.return_value.eq.return_value.order.return_value
+            .limit.return_value.offset.return_value.execute
+        )
+        mock_execute.return_value = mock_table_response([issue_data])
+        mock_query.upsert.return_value.execute.return_value = mock_table_response([issue_data])
+        mock_supabase.table.return_value = mock_query
+
+        repo = IssueRepository(mock_supabase)
+
+        # Execute - second call hits the cache
+        first = repo.list_by_newspaper(newspaper_id)
+        second = repo.list_by_newspaper(newspaper_id)
+
+        # Assert
+        assert mock_execute.call_count == 1
+        assert first == second
+
+        # Creating an issue invalidates the cache
+        repo.create_or_get(newspaper_id=newspaper_id, issue_date=date(1925, 1, 16))
+        repo.list_by_newspaper(newspaper_id)
+        assert mock_execute.call_count == 2
+
+    def test_list_by_newspaper_breaks_date_ties_by_id(
+        self, mock_supabase, mock_table_response, postgrest_execute
+    ):
+        """Test list_by_newspaper orders by (issue_date, id) in a single order param."""
+        postgrest_execute.return_value = mock_table_response([])
+        repo = IssueRepository(mock_supabase)
+
+        repo.list_by_newspaper(uuid4(), order_desc=True)
+        repo.list_by_newspaper(uuid4(), order_desc=False)
+
+        orders = [
+            call.args[0].params.get_list("order") for call in postgrest_execute.call_args_list
+        ]
+        assert orders == [["issue_date.desc,id.desc"], ["issue_date,id"]]
+
+    def test_list_offset_uses_list_page_order(
+        self, mock_supabase, mock_table_response, postgrest_execute
+    ):
+        """Test list_offset orders like list_page before applying the offset."""
+        # Setup
+        newspaper_id = uuid4()
+        postgrest_execute.return_value = mock_table_response([])
+
+        # Execute
+        repo = IssueRepository(mock_supabase)
+        result = repo.list_offset(limit=50, offset=100, newspaper_id=newspaper_id)
+
+        # Assert - on the params PostgREST would receive
+        params = postgrest_execute.call_args.args[0].params
+        assert params["newspaper_id"] == f"eq.{newspaper_id}"
+        assert params.get_list("order") == ["issue_date.desc,id.desc"]
+        assert params["limit"] == "50"
+        assert params["offset"] == "100"
+        assert result == []
+
+    def test_get_many_by_dates_single_query(self, mock_supabase, mock_table_response):
+        """Test get_many_by_dates looks up all dates in one request."""
+        # Setup
+        newspaper_id = uuid4()
+        rows = [
+            {
+                "id": str(uuid4()),
+                "newspaper_id": str(newspaper_id),
+                "issue_date": issue_date,
+                "num_pages": 8,
+                "source_type": "upload",
+                "created_at": _NOW,
+                "updated_at": _NOW,
+            }
+            for issue_date in ("1920-01-15", "1920-01-16")
+        ]
+
+        mock_query = Mock()
+        mock_in = mock_query.select.return_value.eq.return_value.in_
+        mock_in.return_value.execute.return_value = mock_table_response(rows)
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = IssueRepository(mock_supabase)
+        result = repo.get_many_by_dates(
+            newspaper_id, [date(1920, 1, 15), date(1920, 1, 16), date(1920, 1, 17)]
+        )
+
+        # Assert
+        mock_query.select.return_value.eq.assert_called_once_with("newspaper_id", str(newspaper_id))
+        mock_in.assert_called_once_with("issue_date", ["1920-01-15", "1920-01-16", "1920-01-17"])
+        mock_in.return_value.execute.assert_called_once()
+        assert set(result) == {date(1920, 1, 15), date(1920, 1, 16)}
+
+        # Trusted rows are not parsed, but are still keyed by date
+        trusted = IssueRepository(mock_supabase, trust_rows=True)
+        trusted_result = trusted.get_many_by_dates(
+            newspaper_id, [date(1920, 1, 15), date(1920, 1, 16)]
+        )
+        assert set(trusted_result) == {date(1920, 1, 15), date(1920, 1, 16)}
+
+    def test_get_detail_embeds_newspaper_and_pages(self, mock_supabase, mock_table_response):
+        """Test get_detail fetches the issue, newspaper and pages in one query."""
+        # Setup
+        issue_id = uuid4()
+        detail_data = {
+            "id": str(issue_id),
+            "newspaper_id": str(uuid4()),
+            "issue_date": "1925-01-15",
+            "num_pages": 1,
+            "source_type": "upload",
+            "created_at": _NOW,
+            "newspaper": {"id": str(uuid4()), "name": "The Daily Test"},
+            "pages": [{"id": str(uuid4()), "page_number": 1}],
+        }
+
+        mock_query = Mock()
+        mock_select = mock_query.select
+        mock_order = mock_select.return_value.eq.return_value.order
+        mock_order.return_value.maybe_single.return_value.execute.return_value = (
+            mock_table_response(detail_data)
+        )
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = IssueRepository(mock_supabase)
+        result = repo.get_detail(issue_id)
+
+        # Assert
+        mock_supabase.table.assert_called_once_with("issues")
+        mock_select.assert_called_once_with(
+            f"*,newspaper:newspapers(*),pages({PageRepository.SUMMARY_COLUMNS})"
+        )
+        mock_order.assert_called_once_with("page_number", foreign_table="pages")
+        assert result == detail_data
+
+    def test_count_all_is_cached(self, mock_supabase, mock_table_response):
+        """Test count_all counts per newspaper and caches the result."""
+        # Setup
+        newspaper_id = uuid4()
+        mock_query = Mock()
+        mock_select = mock_query.select
+        mock_execute = mock_select.return_value.eq.return_value.limit.return_value.execute
+        mock_execute.return_value = mock_table_response([], count=7)
+        mock_supabase.table.return_value = mock_query
+
+        repo = IssueRepository(mock_supabase)
+
+        # Execute - second call hits the cache
+        first = repo.count_all(newspaper_id)
+        second = repo.count_all(newspaper_id)
+
+        # Assert
+        mock_select.assert_called_once_with("id", count="exact")
+        mock_select.return_value.eq.assert_called_once_with("newspaper_id", str(newspaper_id))
+        mock_select.return_value.eq.return_value.limit.assert_called_once_with(0)
+        assert first == second == 7
+        assert mock_execute.call_count == 1
+
+        # Deleting an issue drops the cached count
+        repo.delete(uuid4())
+        repo.count_all(newspaper_id)
+        assert mock_execute.call_count == 2
+
+    def test_list_page_returns_next_cursor(self, mock_supabase, mock_table_response):
+        """Test list_page fetches one extra row and returns a cursor for the next page."""
+        # Setup
+        rows = [
+            {
+                "id": str(uuid4()),
+                "newspaper_id": str(uuid4()),
+                "issue_date": f"1925-01-{day:02d}",
+                "num_pages": 8,
+                "source_type": "upload",
+                "source_external_id": None,
+                "metadata": None,
+                "created_at": _NOW,
+            }
+            for day in (17, 16, 15)
+        ]
+
+        mock_query = Mock()
+        mock_limit = mock_query.select.return_value.order.return_value.limit
+        mock_limit.return_value.execute.return_value = mock_table_response(rows)
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = IssueRepository(mock_supabase)
+        result, next_cursor = repo.list_page(limit=2)
+
+        # Assert
+        mock_limit.assert_called_once_with(3)
+        assert [issue.issue_date for issue in result] == [date(1925, 1, 17), date(1925, 1, 16)]
+        assert decode_cursor(next_cursor, 2) == ["1925-01-16", rows[1]["id"]]
+
+    def test_list_page_after_cursor(
+        self, mock_supabase, mock_table_response, postgrest_execute
+    ):
+        """Test list_page filters and orders on (issue_date, id) instead of using an offset."""
+        # Setup
+        last_id = uuid4()
+        postgrest_execute.return_value = mock_table_response([])
+
+        # Execute
+        repo = IssueRepository(mock_supabase)
+        result, next_cursor = repo.list_page(
+            limit=2, cursor=encode_cursor(date(1925, 1, 16), last_id)
+        )
+
+        # Assert - on the params PostgREST would receive
+        params = postgrest_execute.call_args.args[0].params
+        assert params.get_list("or") == [
+            f'(issue_date.lt."1925-01-16",and(issue_date.eq."1925-01-16",id.lt.{last_id}))'
+        ]
+        # One order param: PostgREST would ignore a second one
+        assert params.get_list("order") == ["issue_date.desc,id.desc"]
+        assert params["limit"] == "3"
+        assert "offset" not in params
+        assert result == []
+        assert next_cursor is None
+
+    def test_list_page_invalid_cursor(self, mock_supabase):
+        """Test list_page rejects a malformed cursor."""
+        repo = IssueRepository(mock_supabase)
+
+        with pytest.raises(ValueError):
+            repo.list_page(cursor=encode_cursor("1925-01-16", "not-a-uuid"))
+
 
 class TestPageRepository:
     """Test page repository operations."""
@@ -237,14 +570,11 @@ class TestPageRepository:
             "ocr_version": None,
             "ocr_meta": None,
             "ingestion_status": "pending",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "created_at": _NOW,
+            "updated_at": _NOW,
         }
 
-        mock_query = Mock()
-        mock_query.select.return_value.eq.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
-            mock_table_response(page_data)
-        )
+        mock_query = _make_chain(mock_table_response(page_data))
         mock_supabase.table.return_value = mock_query
 
         # Execute
@@ -255,6 +585,38 @@ class TestPageRepository:
         assert result is not None
         assert result.page_number == 1
 
+    def test_get_many_by_issue_single_query(self, mock_supabase, mock_table_response):
+        """Test get_many_by_issue looks up all page numbers in one request."""
+        # Setup
+        issue_id = uuid4()
+        rows = [
+            {
+                "id": str(uuid4()),
+                "issue_id": str(issue_id),
+                "page_number": page_number,
+                "image_path": f"/test/path/page{page_number}.png",
+                "ingestion_status": "pending",
+                "created_at": _NOW,
+                "updated_at": _NOW,
+            }
+            for page_number in (1, 3)
+        ]
+
+        mock_query = Mock()
+        mock_in = mock_query.select.return_value.eq.return_value.in_
+        mock_in.return_value.execute.return_value = mock_table_response(rows)
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = PageRepository(mock_supabase)
+        result = repo.get_many_by_issue(issue_id, [1, 2, 3])
+
+        # Assert
+        mock_in.assert_called_once_with("page_number", [1, 2, 3])
+        mock_in.return_value.execute.assert_called_once()
+        assert sorted(result) == [1, 3]
+        assert result[3].image_path == "/test/path/page3.png"
+
     def test_create_or_get_new_page(self, mock_supabase, mock_table_response):
         """Test create_or_get creates new page."""
         # Setup
@@ -272,16 +634,11 @@ class TestPageRepository:
             "ocr_version": None,
             "ocr_meta": None,
             "ingestion_status": "pending",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "created_at": _NOW,
+            "updated_at": _NOW,
         }
 
         mock_query = Mock()
-        # First call (select) returns None
-        mock_query.select.return_value.eq.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
-            mock_table_response(None)
-        )
-        # Second call (upsert) returns created page
         mock_query.upsert.return_value.execute.return_value = mock_table_response([created_data])
         mock_supabase.table.return_value = mock_query
 
@@ -293,9 +650,87 @@ class TestPageRepository:
             image_path="/test/path/page1.png",
         )
 
-        # Assert
+        # Assert - a single insert-or-ignore, no lookup
         assert isinstance(result, Page)
         assert result.page_number == 1
+        mock_query.upsert.assert_called_once()
+        assert mock_query.upsert.call_args.kwargs["on_conflict"] == "issue_id,page_number"
+        assert mock_query.upsert.call_args.kwargs["ignore_duplicates"] is True
+        mock_query.select.assert_not_called()
+
+    def test_create_or_get_existing_page(self, mock_supabase, mock_table_response):
+        """Test create_or_get returns the existing page unchanged."""
+        # Setup
+        issue_id = uuid4()
+        existing_data = {
+            "id": str(uuid4()),
+            "issue_id": str(issue_id),
+            "page_number": 1,
+            "image_path": "/original/path/page1.png",
+            "ingestion_status": "ocr_completed",
+            "created_at": _NOW,
+            "updated_at": _NOW,
+        }
+
+        mock_query = _make_chain(mock_table_response(existing_data))
+        # Insert is ignored: the page already exists
+        mock_query.upsert.return_value.execute.return_value = mock_table_response([])
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = PageRepository(mock_supabase)
+        result = repo.create_or_get(
+            issue_id=issue_id,
+            page_number=1,
+            image_path="/new/path/page1.png",
+        )
+
+        # Assert
+        assert result.image_path == "/original/path/page1.png"
+        assert result.ingestion_status == "ocr_completed"
+
+    def test_bulk_upsert_single_request(self, mock_supabase, mock_table_response):
+        """Test bulk_upsert writes all pages with one upsert call."""
+        # Setup
+        issue_id = uuid4()
+        records = [
+            PageCreate(issue_id=issue_id, page_number=n, image_path=f"/test/path/page{n}.png")
+            for n in (1, 2)
+        ]
+        rows = [
+            {
+                "id": str(uuid4()),
+                "issue_id": str(issue_id),
+                "page_number": record.page_number,
+                "image_path": record.image_path,
+                "ingestion_status": "pending",
+                "created_at": _NOW,
+                "updated_at": _NOW,
+            }
+            for record in records
+        ]
+
+        mock_query = Mock()
+        mock_query.upsert.return_value.execute.return_value = mock_table_response(rows)
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = PageRepository(mock_supabase)
+        result = repo.bulk_upsert(records)
+
+        # Assert
+        mock_query.upsert.assert_called_once()
+        payload = mock_query.upsert.call_args.args[0]
+        assert [row["page_number"] for row in payload] == [1, 2]
+        assert mock_query.upsert.call_args.kwargs == {"on_conflict": "issue_id,page_number"}
+        assert [page.page_number for page in result] == [1, 2]
+
+    def test_bulk_upsert_empty(self, mock_supabase):
+        """Test bulk_upsert with no records makes no request."""
+        repo = PageRepository(mock_supabase)
+
+        assert repo.bulk_upsert([]) == []
+        mock_supabase.table.assert_not_called()
 
     def test_update_ocr(self, mock_supabase, mock_table_response):
         """Test update_ocr updates page with OCR results."""
@@ -314,8 +749,8 @@ class TestPageRepository:
             "ocr_version": "v1",
             "ocr_meta": None,
             "ingestion_status": "ocr_completed",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "created_at": _NOW,
+            "updated_at": _NOW,
         }
 
         mock_query = Mock()
@@ -332,11 +767,247 @@ class TestPageRepository:
             ocr_version="v1",
         )
 
-        # Assert
+        # Assert - unset optional fields are left out of the update
+        mock_query.update.assert_called_once_with(
+            {
+                "ocr_text": "Sample OCR text",
+                "ingestion_status": "ocr_completed",
+                "ocr_confidence": 0.95,
+                "ocr_provider": "test_ocr",
+                "ocr_version": "v1",
+            }
+        )
         assert result.ocr_text == "Sample OCR text"
         assert result.ocr_confidence == 0.95
         assert result.ingestion_status == "ocr_completed"
 
+    def test_list_by_issue_skips_unrendered_columns(self, mock_supabase, mock_table_response):
+        """Test list_by_issue selects only the list columns."""
+        # Setup
+        issue_id = uuid4()
+        page_data = {
+            "id": str(uuid4()),
+            "issue_id": str(issue_id),
+            "page_number": 1,
+            "image_path": "/test/path/page1.png",
+            "ocr_text": "Sample OCR text",
+            "ocr_confidence": 0.95,
+            "ocr_provider": "test_ocr",
+            "ingestion_status": "ocr_completed",
+            "created_at": _NOW,
+            "updated_at": _NOW,
+        }
+
+        mock_query = Mock()
+        mock_query.select.return_value.eq.return_value.order.return_value.execute.return_value = (
+            mock_table_response([page_data])
+        )
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = PageRepository(mock_supabase)
+        result = repo.list_by_issue(issue_id)
+
+        # Assert
+        mock_query.select.assert_called_once_with(PageRepository.LIST_COLUMNS)
+        assert "ocr_meta" not in PageRepository.LIST_COLUMNS
+        assert len(result) == 1
+        assert result[0].ocr_text == "Sample OCR text"
+        assert result[0].ocr_meta is None
+
+    def test_list_by_issue_lite_skips_ocr_columns(self, mock_supabase, mock_table_response):
+        """Test list_by_issue_lite selects summary columns and returns PageSummary."""
+        # Setup
+        issue_id = uuid4()
+        page_data = {
+            "id": str(uuid4()),
+            "issue_id": str(issue_id),
+            "page_number": 1,
+            "image_path": "/test/path/page1.png",
+            "ingestion_status": "ocr_completed",
+            "created_at": _NOW,
+            "updated_at": _NOW,
+        }
+
+        mock_query = Mock()
+        mock_query.select.return_value.eq.return_value.order.return_value.execute.return_value = (
+            mock_table_response([page_data])
+        )
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = PageRepository(mock_supabase)
+        result = repo.list_by_issue_lite(issue_id)
+
+        # Assert
+        mock_query.select.assert_called_once_with(PageRepository.SUMMARY_COLUMNS)
+        assert "ocr_text" not in PageRepository.SUMMARY_COLUMNS
+        assert len(result) == 1
+        assert isinstance(result[0], PageSummary)
+        assert result[0].page_number == 1
+
+    def test_list_by_issue_ids_single_query(self, mock_supabase, mock_table_response):
+        """Test list_by_issue_ids fetches pages for all issues in one request."""
+        # Setup
+        issue_a, issue_b, issue_empty = uuid4(), uuid4(), uuid4()
+        rows = [
+            {
+                "id": str(uuid4()),
+                "issue_id": str(issue_id),
+                "page_number": page_number,
+                "image_path": f"/test/path/page{page_number}.png",
+                "ingestion_status": "pending",
+                "created_at": _NOW,
+                "updated_at": _NOW,
+            }
+            for issue_id, page_number in ((issue_a, 1), (issue_b, 1), (issue_a, 2))
+        ]
+
+        mock_query = Mock()
+        mock_in = mock_query.select.return_value.in_
+        mock_in.return_value.order.return_value.execute.return_value = mock_table_response(rows)
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = PageRepository(mock_supabase)
+        result = repo.list_by_issue_ids([issue_a, issue_b, issue_empty])
+
+        # Assert
+        mock_in.assert_called_once_with("issue_id", [str(issue_a), str(issue_b), str(issue_empty)])
+        assert [page.page_number for page in result[issue_a]] == [1, 2]
+        assert [page.page_number for page in result[issue_b]] == [1]
+        assert result[issue_empty] == []
+
+    def test_list_by_issue_ids_non_canonical_strings(self, mock_supabase, mock_table_response):
+        """Test list_by_issue_ids matches upper-case string IDs to the rows returned."""
+        # Setup
+        issue_id = uuid4()
+        row = {
+            "id": str(uuid4()),
+            "issue_id": str(issue_id),
+            "page_number": 1,
+            "image_path": "/test/path/page1.png",
+            "ingestion_status": "pending",
+            "created_at": _NOW,
+            "updated_at": _NOW,
+        }
+
+        mock_query = Mock()
+        mock_in = mock_query.select.return_value.in_
+        mock_in.return_value.order.return_value.execute.return_value = mock_table_response([row])
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = PageRepository(mock_supabase, trust_rows=True)
+        requested_id = str(issue_id).upper()
+        result = repo.list_by_issue_ids([requested_id])
+
+        # Assert - keyed by the caller's ID, queried with the canonical one
+        mock_in.assert_called_once_with("issue_id", [str(issue_id)])
+        assert [page.page_number for page in result[requested_id]] == [1]
+
+    def test_list_by_issue_ids_empty(self, mock_supabase):
+        """Test list_by_issue_ids with no IDs makes no request."""
+        repo = PageRepository(mock_supabase)
+
+        assert repo.list_by_issue_ids([]) == {}
+        mock_supabase.table.assert_not_called()
+
+    def test_get_by_id_is_cached_until_update(self, mock_supabase, mock_table_response):
+        """Test get_by_id serves repeat reads from the cache and update invalidates it."""
+        # Setup
+        page_id = uuid4()
+        page_data = {
+            "id": str(page_id),
+            "issue_id": str(uuid4()),
+            "page_number": 1,
+            "image_path": "/test/path/page1.png",
+            "ingestion_status": "pending",
+            "created_at": _NOW,
+            "updated_at": _NOW,
+        }
+
+        mock_query = Mock()
+        mock_execute = mock_query.select.return_value.eq.return_value.maybe_single.return_value.execute
+        mock_execute.return_value = mock_table_response(page_data)
+        mock_query.update.return_value.eq.return_value.execute.return_value = mock_table_response(
+            [dict(page_data, ingestion_status="ocr_pending")]
+        )
+        mock_supabase.table.return_value = mock_query
+
+        repo = PageRepository(mock_supabase)
+
+        # Execute - second call hits the cache
+        first = repo.get_by_id(page_id)
+        second = repo.get_by_id(page_id)
+
+        # Assert
+        assert mock_execute.call_count == 1
+        assert first is second
+
+        # Updating the page invalidates the cache
+        repo.update_status(page_id, "ocr_pending")
+        repo.get_by_id(page_id)
+        assert mock_execute.call_count == 2
+
+    def test_completed_pages_are_cached_longer(self, mock_supabase):
+        """Test pages with completed OCR get the long cache TTL."""
+        repo = PageRepository(mock_supabase)
+        page = Page(
+            id=uuid4(),
+            issue_id=uuid4(),
+            page_number=1,
+            image_path="/test/path/page1.png",
+            ingestion_status="pending",
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+        )
+        completed = page.model_copy(update={"ingestion_status": "ocr_completed"})
+
+        assert repo._page_cache_ttu(("page",), page, 0) == PageRepository.PAGE_CACHE_TTL
+        assert repo._page_cache_ttu(("page",), completed, 0) == PageRepository.COMPLETED_PAGE_CACHE_TTL
+
+    def test_list_by_status_keyset(
+        self, mock_supabase, mock_table_response, postgrest_execute
+    ):
+        """Test list_by_status pages by (created_at, id) and returns a cursor."""
+        # Setup
+        last_id = uuid4()
+        page_data = {
+            "id": str(uuid4()),
+            "issue_id": str(uuid4()),
+            "page_number": 1,
+            "image_path": "/test/path/page1.png",
+            "ingestion_status": "pending",
+            "created_at": "2025-01-01T00:00:00+00:00",
+            "updated_at": "2025-01-01T00:00:00+00:00",
+        }
+
+        postgrest_execute.return_value = mock_table_response(
+            [page_data, dict(page_data, id=str(uuid4()))]
+        )
+
+        # Execute
+        repo = PageRepository(mock_supabase)
+        result, next_cursor = repo.list_by_status(
+            ["pending", "ocr_failed"],
+            limit=1,
+            cursor=encode_cursor("2025-01-02T00:00:00+00:00", last_id),
+        )
+
+        # Assert - on the params PostgREST would receive
+        params = postgrest_execute.call_args.args[0].params
+        assert params["ingestion_status"] == "in.(pending,ocr_failed)"
+        assert params.get_list("or") == [
+            '(created_at.lt."2025-01-02T00:00:00+00:00",'
+            f'and(created_at.eq."2025-01-02T00:00:00+00:00",id.lt.{last_id}))'
+        ]
+        assert params.get_list("order") == ["created_at.desc,id.desc"]
+        assert len(result) == 1
+        created_at, cursor_id = decode_cursor(next_cursor, 2)
+        assert datetime.fromisoformat(created_at) == result[0].created_at
+        assert cursor_id == page_data["id"]
+
 
 class TestIngestJobRepository:
     """Test ingest job repository operations."""
@@ -359,14 +1030,11 @@ class TestIngestJobRepository:
                 "errors": [],
             },
             "error_message": None,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "created_at": _NOW,
+            "updated_at": _NOW,
         }
 
-        mock_query = Mock()
-        mock_query.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
-            mock_table_response(job_data)
-        )
+        mock_query = _make_chain(mock_table_response(job_data))
         mock_supabase.table.return_value = mock_query
 
         # Execute
@@ -395,8 +1063,8 @@ class TestIngestJobRepository:
                 "errors": [],
             },
             "error_message": None,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "created_at": _NOW,
+            "updated_at": _NOW,
         }
 
         mock_query = Mock()
@@ -432,8 +1100,8 @@ class TestIngestJobRepository:
                 "errors": [],
             },
             "error_message": None,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "created_at": _NOW,
+            "updated_at": _NOW,
         }
 
         mock_query = Mock()
@@ -457,7 +1125,6 @@ class TestIngestJobRepository:
         # Setup
         job_id = uuid4()
 
-        # Mock get_by_id to return existing job
         existing_job_data = {
             "id": str(job_id),
             "idempotency_key": "test-key-123",
@@ -472,8 +1139,8 @@ class TestIngestJobRepository:
                 "errors": [],
             },
             "error_message": None,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "created_at": _NOW,
+            "updated_at": _NOW,
         }
 
         updated_job_data = {
@@ -488,14 +1155,8 @@ class TestIngestJobRepository:
             },
         }
 
-        mock_query = Mock()
-        # First call (get_by_id via select)
-        mock_query.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
-            mock_table_response(existing_job_data)
-        )
-        # Second call (update)
-        mock_query.update.return_value.eq.return_value.execute.return_value = mock_table_response([updated_job_data])
-        mock_supabase.table.return_value = mock_query
+        # Single RPC call returns the updated row
+        mock_supabase.rpc.return_value.execute.return_value = mock_table_response([updated_job_data])
 
         # Execute
         repo = IngestJobRepository(mock_supabase)
@@ -507,9 +1168,29 @@ class TestIngestJobRepository:
         )
 
         # Assert
+        mock_supabase.rpc.assert_called_once_with(
+            "increment_ingest_progress",
+            {
+                "job_id": str(job_id),
+                "pages_processed": 5,
+                "pages_total": 10,
+                "stage": "ocr",
+                "err": None,
+            },
+        )
+        mock_supabase.table.assert_not_called()
         assert result.progress["pages_processed"] == 5
         assert result.progress["pages_succeeded"] == 5
 
+    def test_increment_progress_job_not_found(self, mock_supabase, mock_table_response):
+        """Test increment_progress raises when the job does not exist."""
+        mock_supabase.rpc.return_value.execute.return_value = mock_table_response([])
+
+        repo = IngestJobRepository(mock_supabase)
+
+        with pytest.raises(ValueError, match="not found"):
+            repo.increment_progress(job_id=uuid4(), pages_processed=1, pages_total=10)
+
 
 class TestBaseRepository:
     """Test base repository operations."""
@@ -527,13 +1208,10 @@ class TestBaseRepository:
             "end_year": None,
             "description": None,
             "source_type": "upload",
-            "created_at": datetime.now().isoformat(),
+            "created_at": _NOW,
         }
 
-        mock_query = Mock()
-        mock_query.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
-            mock_table_response(newspaper_data)
-        )
+        mock_query = _make_chain(mock_table_response(newspaper_data))
         mock_supabase.table.return_value = mock_query
 
         # Execute
@@ -557,7 +1235,7 @@ class TestBaseRepository:
                 "end_year": None,
                 "description": None,
                 "source_type": "upload",
-                "created_at": datetime.now().isoformat(),
+                "created_at": _NOW,
             },
             {
                 "id": str(uuid4()),
@@ -568,7 +1246,7 @@ class TestBaseRepository:
                 "end_year": None,
                 "description": None,
                 "source_type": "upload",
-                "created_at": datetime.now().isoformat(),
+                "created_at": _NOW,
             },
         ]
 
@@ -586,3 +1264,125 @@ class TestBaseRepository:
         assert len(result) == 2
         assert result[0].name == "Paper 1"
         assert result[1].name == "Paper 2"
+
+    def test_create_excludes_none_values(self, mock_supabase, mock_table_response):
+        """Test create inserts only the non-None fields of the create model."""
+        # Setup
+        created_data = {
+            "id": str(uuid4()),
+            "name": "New Paper",
+            "city": "Boston",
+            "country": None,
+            "start_year": None,
+            "end_year": None,
+            "description": None,
+            "source_type": "upload",
+            "created_at": _NOW,
+        }
+
+        mock_query = Mock()
+        mock_query.insert.return_value.execute.return_value = mock_table_response([created_data])
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = NewspaperRepository(mock_supabase)
+        result = repo.create(NewspaperCreate(name="New Paper", city="Boston"))
+
+        # Assert
+        mock_query.insert.assert_called_once_with(
+            {"name": "New Paper", "city": "Boston", "source_type": "upload"}
+        )
+        assert result.name == "New Paper"
+
+    def test_count(self, mock_supabase, mock_table_response):
+        """Test count reads the exact total without fetching rows."""
+        # Setup
+        mock_query = Mock()
+        mock_query.select.return_value.limit.return_value.execute.return_value = (
+            mock_table_response([], count=42)
+        )
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = NewspaperRepository(mock_supabase)
+        result = repo.count()
+
+        # Assert
+        assert result == 42
+        mock_query.select.assert_called_once_with("id", count="exact")
+        mock_query.select.return_value.limit.assert_called_once_with(0)
+
+    def test_list_all_trusted_rows_skip_validation(self, mock_supabase, mock_table_response):
+        """Test list_all builds models without validation when trust_rows is set."""
+        # Setup
+        newspaper_id = str(uuid4())
+        newspapers_data = [
+            {
+                "id": newspaper_id,
+                "name": "Paper 1",
+                "source_type": "upload",
+                "created_at": _NOW,
+            },
+        ]
+
+        mock_query = Mock()
+        mock_query.select.return_value.limit.return_value.offset.return_value.execute.return_value = (
+            mock_table_response(newspapers_data)
+        )
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = NewspaperRepository(mock_supabase, trust_rows=True)
+        result = repo.list_all(limit=10, offset=0)
+
+        # Assert - values are taken as-is (no UUID coercion)
+        assert isinstance(result[0], Newspaper)
+        assert result[0].id == newspaper_id
+        assert result[0].city is None
+
+    def test_create_many_single_request(self, mock_supabase, mock_table_response):
+        """Test create_many inserts all rows with one request."""
+        # Setup
+        issue_id = uuid4()
+        created_rows = [
+            {
+                "id": str(uuid4()),
+                "issue_id": str(issue_id),
+                "page_number": number,
+                "image_path": f"/test/path/page{number}.png",
+                "ingestion_status": "pending",
+                "created_at": _NOW,
+                "updated_at": _NOW,
+            }
+            for number in (1, 2, 3)
+        ]
+
+        mock_query = Mock()
+        mock_query.insert.return_value.execute.return_value = mock_table_response(created_rows)
+        mock_supabase.table.return_value = mock_query
+
+        # Execute
+        repo = PageRepository(mock_supabase)
+        result = repo.create_many(
+            [
+                PageCreate(
+                    issue_id=issue_id,
+                    page_number=number,
+                    image_path=f"/test/path/page{number}.png",
+                )
+                for number in (1, 2, 3)
+            ]
+        )
+
+        # Assert
+        mock_query.insert.assert_called_once()
+        payload = mock_query.insert.call_args.args[0]
+        assert [row["page_number"] for row in payload] == [1, 2, 3]
+        assert [page.page_number for page in result] == [1, 2, 3]
+
+    def test_create_many_empty(self, mock_supabase):
+        """Test create_many with no items makes no request."""
+        repo = PageRepository(mock_supabase)
+
+        assert repo.create_many([]) == []
+        mock_supabase.table.assert_not_called()